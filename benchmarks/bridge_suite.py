@@ -0,0 +1,378 @@
+"""
+CPython benchmark suite for the bridge package.
+
+Every benchmark runs against an instrumented fake ``js.document`` that counts
+the calls and attribute writes which would each be a Python -> JS proxy
+crossing in Pyodide ("FFI calls"), and measures wall time at several sizes.
+
+Usage:
+    python benchmarks/bridge_suite.py                       # print a table
+    python benchmarks/bridge_suite.py --output before.json  # save results
+    python benchmarks/bridge_suite.py --compare before.json # diff vs. a run
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pyodide_app import vfs_controller  # noqa: E402
+from pyodide_app.bridge import bindings, vdom  # noqa: E402
+from pyodide_app.bridge.reactivity import Signal, observable  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+# --- Instrumented fake DOM ---
+
+
+class FFICounter(Counter):
+    """Tally of simulated Python -> JS crossings, keyed by operation.
+
+    ``ops`` separately counts the DOM operations carried inside batched
+    VDOM op-logs, which cost no extra crossings.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ops = 0
+
+    def hit(self, name: str) -> None:
+        self[name] += 1
+
+
+class FakeElement:
+    """A DOM node whose method calls and attribute writes are counted."""
+
+    _counter: FFICounter
+    tag: str
+    children: List["FakeElement"]
+
+    def __init__(self, counter: FFICounter, tag: str = "") -> None:
+        object.__setattr__(self, "_counter", counter)
+        object.__setattr__(self, "tag", tag)
+        object.__setattr__(self, "children", [])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._counter.hit(f"set {name}")
+        object.__setattr__(self, name, value)
+
+    def appendChild(self, child: "FakeElement") -> None:  # noqa: N802
+        self._counter.hit("appendChild")
+        self.children.append(child)
+
+    def setAttribute(self, name: str, value: str) -> None:  # noqa: N802
+        self._counter.hit("setAttribute")
+
+
+class FakeDocument:
+    def __init__(self, counter: FFICounter) -> None:
+        self._counter = counter
+        self._by_id: Dict[str, FakeElement] = {}
+
+    def getElementById(self, element_id: str) -> FakeElement:  # noqa: N802
+        self._counter.hit("getElementById")
+        if element_id not in self._by_id:
+            self._by_id[element_id] = FakeElement(self._counter, "div")
+        return self._by_id[element_id]
+
+    def createElement(self, tag: str) -> FakeElement:  # noqa: N802
+        self._counter.hit("createElement")
+        return FakeElement(self._counter, tag)
+
+    def createTextNode(self, text: str) -> FakeElement:  # noqa: N802
+        self._counter.hit("createTextNode")
+        return FakeElement(self._counter)
+
+
+class FakeJS:
+    def __init__(self, counter: FFICounter) -> None:
+        self.document = FakeDocument(counter)
+
+    def requestAnimationFrame(self, callback: Any) -> None:  # noqa: N802
+        pass
+
+    def queueMicrotask(self, callback: Any) -> None:  # noqa: N802
+        pass
+
+
+class CountingApplier(vdom.OpCounter):
+    """Counts each op-log batch as one crossing, plus the ops it carried."""
+
+    def __init__(self, counter: FFICounter) -> None:
+        super().__init__()
+        self._counter = counter
+
+    def apply(self, ops: Sequence[int], strings: Sequence[str]) -> None:
+        self._counter.hit("VDOMApplier.apply")
+        before = self.total
+        super().apply(ops, strings)
+        self._counter.ops += self.total - before
+
+
+# --- Benchmarks ---
+#
+# Each benchmark does its setup and returns the operation to measure. The
+# operation must be repeatable: it is run once to count FFI calls and then
+# timed over several repetitions.
+
+Benchmark = Callable[[int, FakeJS, FFICounter], Callable[[], Any]]
+
+
+def _rows(size: int, version: int) -> vdom.VNode:
+    return vdom.h(
+        "ul",
+        {"class": "rows"},
+        [
+            vdom.h("li", {"key": i}, f"row {i} v{version if i == 0 else 0}")
+            for i in range(size)
+        ],
+    )
+
+
+def bench_vdom_mount(size: int, fake: FakeJS, counter: FFICounter) -> Callable[[], Any]:
+    """Initial render of ``size`` keyed rows."""
+
+    def run() -> None:
+        engine = vdom.PythonVDOM("root", applier=CountingApplier(counter))
+        engine.patch(_rows(size, 0))
+
+    return run
+
+
+def bench_vdom_patch(size: int, fake: FakeJS, counter: FFICounter) -> Callable[[], Any]:
+    """Re-render ``size`` keyed rows where a single row's text changed."""
+    engine = vdom.PythonVDOM("root", applier=CountingApplier(counter))
+    engine.patch(_rows(size, 0))
+    versions = iter(range(1, 1 << 30))
+
+    def run() -> None:
+        engine.patch(_rows(size, next(versions)))
+
+    return run
+
+
+def bench_signal_fanout(
+    size: int, fake: FakeJS, counter: FFICounter
+) -> Callable[[], Any]:
+    """One ``Signal`` write fanned out to ``size`` DOM-writing subscribers."""
+    signal = Signal(0)
+    for i in range(size):
+        element_id = f"sig-{i}"
+        signal.subscribe(
+            lambda v, eid=element_id: setattr(
+                fake.document.getElementById(eid), "innerText", str(v)
+            )
+        )
+
+    def run() -> None:
+        signal.value += 1
+
+    return run
+
+
+@observable
+@dataclass
+class _BenchState:
+    count: int = 0
+    label: str = ""
+
+
+def bench_observable_writes(
+    size: int, fake: FakeJS, counter: FFICounter
+) -> Callable[[], Any]:
+    """``size`` writes to an observed ``@observable`` field."""
+    state: Any = _BenchState()
+    element = fake.document.getElementById("obs")
+    state.subscribe("count", lambda v: setattr(element, "innerText", str(v)))
+
+    def run() -> None:
+        for i in range(size):
+            state.count = i
+
+    return run
+
+
+def bench_bind_to_dom(
+    size: int, fake: FakeJS, counter: FFICounter
+) -> Callable[[], Any]:
+    """``size`` writes to a field with two DOM bindings, then one flush."""
+    state = _BenchState()
+    table = bindings.BindingTable(clock=fake.queueMicrotask)
+    table.bind(state, "count", "count-display")
+    table.bind(state, "count", "count-badge", "title")
+    table.flush()
+
+    def run() -> None:
+        for _ in range(size):
+            state.count += 1
+        table.flush()
+
+    return run
+
+
+def bench_fs_render_node(
+    size: int, fake: FakeJS, counter: FFICounter
+) -> Callable[[], Any]:
+    """``FSExplorer.render_node`` for a directory holding ``size`` files."""
+    explorer = vfs_controller.FSExplorer.__new__(vfs_controller.FSExplorer)
+    tree = {
+        "name": "home",
+        "path": "/home",
+        "type": "dir",
+        "children": [
+            {"name": f"f{i}.py", "path": f"/home/f{i}.py", "type": "file", "size": i}
+            for i in range(size)
+        ],
+    }
+
+    def run() -> None:
+        explorer.render_node(tree)
+
+    return run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "vdom_mount": bench_vdom_mount,
+    "vdom_patch": bench_vdom_patch,
+    "signal_fanout": bench_signal_fanout,
+    "observable_writes": bench_observable_writes,
+    "bind_to_dom": bench_bind_to_dom,
+    "fs_render_node": bench_fs_render_node,
+}
+
+# Modules whose ``js`` global is swapped for the instrumented fake.
+_PATCHED_MODULES = (bindings, vdom, vfs_controller)
+
+
+# --- Harness ---
+
+
+def run_benchmark(
+    name: str, size: int, repeat: int = 5, number: int = 0
+) -> Dict[str, Any]:
+    counter = FFICounter()
+    fake = FakeJS(counter)
+    patches = [patch.object(module, "js", fake) for module in _PATCHED_MODULES]
+    for p in patches:
+        p.start()
+    try:
+        run = BENCHMARKS[name](size, fake, counter)
+        counter.clear()
+        counter.ops = 0
+        run()
+        calls = dict(counter)
+        ops = counter.ops
+
+        timer = timeit.Timer(run)
+        if not number:
+            number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    return {
+        "benchmark": name,
+        "size": size,
+        "seconds": seconds,
+        "ffi_calls": sum(calls.values()),
+        "dom_ops": ops,
+        "calls": calls,
+    }
+
+
+def run_suite(
+    names: Optional[Sequence[str]] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    results = [
+        run_benchmark(name, size, repeat=repeat)
+        for name in (names or BENCHMARKS)
+        for size in sizes
+    ]
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def _index(report: Dict[str, Any]) -> Dict[Any, Dict[str, Any]]:
+    return {(r["benchmark"], r["size"]): r for r in report["results"]}
+
+
+def print_report(
+    report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None
+) -> None:
+    previous = _index(baseline) if baseline else {}
+    header = (
+        f"{'benchmark':<20}{'size':>7}{'time (us)':>13}{'ffi calls':>11}{'dom ops':>9}"
+    )
+    if previous:
+        header += f"{'time':>9}{'calls':>9}"
+    print(header)
+    for result in report["results"]:
+        line = (
+            f"{result['benchmark']:<20}{result['size']:>7}"
+            f"{result['seconds'] * 1e6:>13.1f}{result['ffi_calls']:>11}"
+            f"{result['dom_ops']:>9}"
+        )
+        before = previous.get((result["benchmark"], result["size"]))
+        if before:
+            line += f"{_ratio(result['seconds'], before['seconds']):>9}"
+            line += f"{_ratio(result['ffi_calls'], before['ffi_calls']):>9}"
+        print(line)
+
+
+def _ratio(new: float, old: float) -> str:
+    if not old:
+        return "-" if not new else "new"
+    return f"{new / old:.2f}x"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="benchmark",
+        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    report = run_suite(args.benchmarks, args.sizes, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: attribute writes on a 20-field ``@observable`` dataclass.
+
+Compares a plain dataclass, the original ``@observable`` that overrode
+``__setattr__`` for every write, and the current one that hooks a field only
+once it has been subscribed. Writes go to a field nobody observes and to one
+with a single no-op subscriber; observed writes now also pay for the
+equality check that suppresses unchanged values.
+
+Usage:
+    python benchmarks/observable_fields.py
+"""
+
+import os
+import sys
+import timeit
+from dataclasses import make_dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pyodide_app.bridge.reactivity import observable  # noqa: E402
+
+FIELDS = [(f"f{i}", int, 0) for i in range(20)]
+WRITES = 10_000
+
+
+def setattr_observable(cls: Any) -> Any:
+    """The original generic-``__setattr__`` decorator, kept as the baseline."""
+    orig_init = cls.__init__
+
+    def __init__(self: Any, *args: Any, **kwargs: Any) -> None:  # noqa: N807
+        object.__setattr__(self, "_subscribers", {})
+        orig_init(self, *args, **kwargs)
+
+    def subscribe(self: Any, field_name: str, callback: Callable[[Any], None]) -> None:
+        if field_name not in self._subscribers:
+            self._subscribers[field_name] = []
+        self._subscribers[field_name].append(callback)
+        callback(getattr(self, field_name))
+
+    def __setattr__(self: Any, name: str, value: Any) -> None:  # noqa: N807
+        object.__setattr__(self, name, value)
+        if hasattr(self, "_subscribers") and name in self._subscribers:
+            for cb in self._subscribers[name]:
+                cb(value)
+
+    cls.__init__ = __init__
+    cls.subscribe = subscribe
+    cls.__setattr__ = __setattr__
+    return cls
+
+
+def make_instance(decorator: Callable[[Any], Any], observed: bool) -> Any:
+    cls = make_dataclass("State", FIELDS)
+    instance = decorator(cls)()
+    if observed:
+        instance.subscribe("f0", lambda value: None)
+    return instance
+
+
+def write_unobserved(state: Any) -> None:
+    for i in range(WRITES):
+        state.f7 = i
+
+
+def write_observed(state: Any) -> None:
+    for i in range(WRITES):
+        state.f0 = i
+
+
+def measure(rounds: int = 20) -> Dict[str, List[float]]:
+    """Best-of-N ns per write, interleaving implementations to cancel out drift."""
+    variants = {
+        "plain dataclass": (lambda cls: cls, False),
+        "__setattr__": (setattr_observable, True),
+        "descriptors": (observable, True),
+    }
+    states = {
+        name: make_instance(decorator, observed)
+        for name, (decorator, observed) in variants.items()
+    }
+    best = {name: [float("inf"), float("inf")] for name in variants}
+    for _ in range(rounds):
+        for name, state in states.items():
+            for column, workload in enumerate((write_unobserved, write_observed)):
+                seconds = timeit.timeit(partial(workload, state), number=1)
+                best[name][column] = min(best[name][column], seconds / WRITES)
+    return best
+
+
+def main() -> None:
+    results = measure()
+    print(f"{'impl':<18}{'unobserved ns':>15}{'observed ns':>13}")
+    for name, (unobserved, observed) in results.items():
+        print(f"{name:<18}{unobserved * 1e9:>15.1f}{observed * 1e9:>13.1f}")
+
+    base, new = results["__setattr__"], results["descriptors"]
+    plain = results["plain dataclass"][0]
+    print(
+        f"\nUnobserved writes: {base[0] / new[0]:.1f}x faster than __setattr__, "
+        f"{new[0] / plain:.2f}x the cost of a plain dataclass write. "
+        f"Observed writes: {new[1] / base[1]:.2f}x the __setattr__ cost."
+    )
+
+
+if __name__ == "__main__":
+    main()
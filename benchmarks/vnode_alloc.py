@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: dict-based vnodes vs. the slotted ``VNode`` returned by ``h()``.
+
+Builds a 10k-node tree (5,000 keyed rows, each holding a prop-less span) with
+both representations and reports the retained memory, the number of live
+allocations and the build time.
+
+Usage:
+    python benchmarks/vnode_alloc.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pyodide_app.bridge.vdom import h  # noqa: E402
+
+ROWS = 5_000  # two vnodes per row -> 10k nodes
+
+
+def dict_h(
+    tag: str, props: Optional[Dict[str, Any]] = None, children: Any = None
+) -> Dict[str, Any]:
+    """The original dict-based ``h()``, kept here as the baseline."""
+    return {
+        "tag": tag,
+        "props": props or {},
+        "children": children
+        if isinstance(children, list)
+        else ([children] if children else []),
+    }
+
+
+def build(factory: Callable[..., Any]) -> Any:
+    return factory(
+        "ul",
+        {"class": "rows"},
+        [factory("li", {"key": i}, factory("span", {}, str(i))) for i in range(ROWS)],
+    )
+
+
+def measure_memory(factory: Callable[..., Any]) -> Tuple[int, int]:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tree = build(factory)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del tree
+    return size, blocks
+
+
+def measure_time(
+    factories: Dict[str, Callable[..., Any]], rounds: int = 30
+) -> Dict[str, float]:
+    """Best-of-N build time, interleaving implementations to cancel out drift."""
+    best = {name: float("inf") for name in factories}
+    for _ in range(rounds):
+        for name, factory in factories.items():
+            seconds = timeit.timeit(partial(build, factory), number=3) / 3
+            best[name] = min(best[name], seconds)
+    return best
+
+
+def main() -> None:
+    factories = {"dict": dict_h, "VNode": h}
+    times = measure_time(factories)
+    results = {
+        name: (*measure_memory(factory), times[name])
+        for name, factory in factories.items()
+    }
+    print(f"{'impl':<8}{'retained KiB':>14}{'live blocks':>14}{'build ms':>11}")
+    for name, (size, blocks, seconds) in results.items():
+        print(f"{name:<8}{size / 1024:>14.1f}{blocks:>14}{seconds * 1000:>11.2f}")
+
+    base, new = results["dict"], results["VNode"]
+    print(
+        f"\nVNode saves {1 - new[0] / base[0]:.0%} memory, "
+        f"{1 - new[1] / base[1]:.0%} allocations, "
+        f"{1 - new[2] / base[2]:.0%} build time"
+    )
+
+
+if __name__ == "__main__":
+    main()
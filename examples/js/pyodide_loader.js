@@ -33,6 +33,8 @@ window.loadPyodideAndFiles = async (files = []) => {
     await loadFile(`${prefix}bridge/core.py`, 'bridge/core.py');
     await loadFile(`${prefix}bridge/reactivity.py`, 'bridge/reactivity.py');
     await loadFile(`${prefix}bridge/vdom.py`, 'bridge/vdom.py');
+    await loadFile(`${prefix}bridge/bindings.py`, 'bridge/bindings.py');
+    await loadFile(`${prefix}bridge/shared.py`, 'bridge/shared.py');
 
     for (const f of files) {
         await loadFile(`${prefix}${f}`, f);
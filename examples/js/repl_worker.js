@@ -0,0 +1,36 @@
+/**
+ * Pyodide REPL Worker
+ * Version: 1.0.0
+ *
+ * Hosts pyodide_app/repl.py's ReplEngine off the main thread for the
+ * virtual terminal. stdout/stderr are streamed back line by line through
+ * the callback passed to init(); commands are fed with push().
+ */
+(function() {
+    importScripts("../vendor/comlink.js");
+    importScripts("../vendor/pyodide.js");
+
+    class ReplWorker {
+        async init(replSource, onOutput) {
+            this.pyodide = await loadPyodide({ indexURL: "../vendor/" });
+            const forward = (line) => { onOutput(line + "\n"); };
+            this.pyodide.setStdout({ batched: forward });
+            this.pyodide.setStderr({ batched: forward });
+            this.pyodide.FS.writeFile("repl.py", replSource);
+            await this.pyodide.runPythonAsync(
+                "import repl\n_engine = repl.ReplEngine()"
+            );
+        }
+
+        async push(line) {
+            this.pyodide.globals.set("_line", line);
+            return await this.pyodide.runPythonAsync("await _engine.push(_line)");
+        }
+
+        reset() {
+            this.pyodide.runPython("_engine.reset()");
+        }
+    }
+
+    Comlink.expose(new ReplWorker());
+})();
@@ -0,0 +1,203 @@
+/**
+ * Pyodide Architecture - VDOM Op-Log Applier
+ * Executes the flat mutation buffer emitted by pyodide_app.bridge.vdom, so a
+ * whole render crosses the Python/JS bridge in a single call.
+ *
+ * Opcodes must stay in sync with the OP_* constants in bridge/vdom.py.
+ */
+(function() {
+    const OP_CREATE_ELEMENT = 1;   // id, tag
+    const OP_CREATE_TEXT = 2;      // id, text
+    const OP_SET_ATTR = 3;         // id, name, value
+    const OP_REMOVE_ATTR = 4;      // id, name
+    const OP_SET_TEXT = 5;         // id, text
+    const OP_INSERT = 6;           // parent, child, before (0 appends)
+    const OP_REMOVE = 7;           // id
+    const OP_REPLACE_CHILDREN = 8; // parent, child
+    const OP_DELEGATE = 9;         // event type
+    const OP_ADOPT = 10;           // parent, id, tag
+    const OP_ADOPT_TEXT = 11;      // parent, id, text
+
+    // Events that do not bubble are caught on the way down instead.
+    const CAPTURE_EVENTS = new Set([
+        'blur', 'error', 'focus', 'load', 'mouseenter', 'mouseleave', 'scroll'
+    ]);
+
+    class VDOMApplier {
+        constructor(container, dispatch) {
+            // Node id -> DOM node. Id 0 is always the container.
+            this.nodes = new Map([[0, container]]);
+            this.container = container;
+            this.dispatch = dispatch;
+            this.delegated = new Set();
+            // Event type -> [listener, capture], for destroy().
+            this.listeners = new Map();
+            // Parent id -> next DOM child to adopt while hydrating.
+            this.cursors = new Map();
+        }
+
+        apply(ops, strings) {
+            const nodes = this.nodes;
+            let i = 0;
+            while (i < ops.length) {
+                switch (ops[i]) {
+                    case OP_CREATE_ELEMENT: {
+                        const el = document.createElement(strings[ops[i + 2]]);
+                        el.__vid = ops[i + 1];
+                        nodes.set(ops[i + 1], el);
+                        i += 3;
+                        break;
+                    }
+                    case OP_CREATE_TEXT: {
+                        const text = document.createTextNode(strings[ops[i + 2]]);
+                        text.__vid = ops[i + 1];
+                        nodes.set(ops[i + 1], text);
+                        i += 3;
+                        break;
+                    }
+                    case OP_SET_ATTR:
+                        nodes.get(ops[i + 1]).setAttribute(strings[ops[i + 2]], strings[ops[i + 3]]);
+                        i += 4;
+                        break;
+                    case OP_REMOVE_ATTR:
+                        nodes.get(ops[i + 1]).removeAttribute(strings[ops[i + 2]]);
+                        i += 3;
+                        break;
+                    case OP_SET_TEXT:
+                        nodes.get(ops[i + 1]).data = strings[ops[i + 2]];
+                        i += 3;
+                        break;
+                    case OP_INSERT: {
+                        const before = ops[i + 3] === 0 ? null : nodes.get(ops[i + 3]);
+                        nodes.get(ops[i + 1]).insertBefore(nodes.get(ops[i + 2]), before);
+                        i += 4;
+                        break;
+                    }
+                    case OP_REMOVE: {
+                        const node = nodes.get(ops[i + 1]);
+                        node.remove();
+                        this._forget(node);
+                        i += 2;
+                        break;
+                    }
+                    case OP_REPLACE_CHILDREN:
+                        nodes.get(ops[i + 1]).replaceChildren(nodes.get(ops[i + 2]));
+                        i += 3;
+                        break;
+                    case OP_DELEGATE:
+                        this._delegate(strings[ops[i + 1]]);
+                        i += 2;
+                        break;
+                    case OP_ADOPT:
+                        this._adopt(ops[i + 1], ops[i + 2], strings[ops[i + 3]], null);
+                        i += 4;
+                        break;
+                    case OP_ADOPT_TEXT:
+                        this._adopt(ops[i + 1], ops[i + 2], '', strings[ops[i + 3]]);
+                        i += 4;
+                        break;
+                    default:
+                        throw new Error(`Unknown VDOM opcode ${ops[i]} at offset ${i}`);
+                }
+            }
+            this.cursors.clear();
+        }
+
+        // Claims the next DOM child of parentId: an element with the given tag,
+        // or (tag '') a text node that must hold exactly `text`.
+        _adopt(parentId, id, tag, text) {
+            const parent = this.nodes.get(parentId);
+            let node = this.cursors.has(parentId) ? this.cursors.get(parentId) : parent.firstChild;
+
+            // Drop text separators and skip formatting whitespace around elements.
+            while (node && (node.nodeType === Node.COMMENT_NODE ||
+                            (tag && node.nodeType === Node.TEXT_NODE && !node.data.trim()))) {
+                const next = node.nextSibling;
+                if (node.nodeType === Node.COMMENT_NODE) node.remove();
+                node = next;
+            }
+
+            if (!tag) {
+                if (text === '') {
+                    // Empty strings produce no text node when parsed; recreate them.
+                    const empty = document.createTextNode('');
+                    parent.insertBefore(empty, node);
+                    node = empty;
+                } else if (!node || node.nodeType !== Node.TEXT_NODE || node.data !== text) {
+                    this._mismatch(`text ${JSON.stringify(text)}`, node);
+                }
+            } else if (!node || node.nodeName.toLowerCase() !== tag.toLowerCase()) {
+                this._mismatch(`<${tag}>`, node);
+            }
+
+            node.__vid = id;
+            this.nodes.set(id, node);
+            this.cursors.set(parentId, node.nextSibling);
+        }
+
+        // Forget everything adopted so far, so the client render that
+        // replaces the markup starts from a clean node map.
+        _mismatch(expected, node) {
+            this.cursors.clear();
+            this._resetNodes();
+            const found = !node ? 'nothing'
+                : node.nodeType === Node.TEXT_NODE ? `text ${JSON.stringify(node.data)}`
+                : `<${node.nodeName.toLowerCase()}>`;
+            throw new Error(`Hydration mismatch: expected ${expected}, found ${found}`);
+        }
+
+        _resetNodes() {
+            for (const node of this.nodes.values()) {
+                if (node !== this.container) delete node.__vid;
+            }
+            this.nodes = new Map([[0, this.container]]);
+        }
+
+        _delegate(type) {
+            if (this.delegated.has(type)) return;
+            this.delegated.add(type);
+            // One listener per event type on the container. It collects the
+            // ids of the VDOM nodes from the target up to the container and
+            // lets Python walk its handler table in a single call.
+            const capture = CAPTURE_EVENTS.has(type);
+            const listener = (event) => {
+                const path = [];
+                if (capture) {
+                    // Non-bubbling events only reach their own target.
+                    if (event.target.__vid !== undefined) path.push(event.target.__vid);
+                } else {
+                    for (let node = event.target; node && node !== this.container; node = node.parentNode) {
+                        if (node.__vid !== undefined) path.push(node.__vid);
+                    }
+                }
+                if (path.length > 0) {
+                    this.dispatch(type, path, event);
+                }
+            };
+            this.listeners.set(type, [listener, capture]);
+            this.container.addEventListener(type, listener, capture);
+        }
+
+        // Detach the root listeners before Python destroys the dispatch proxy.
+        destroy() {
+            for (const [type, [listener, capture]] of this.listeners) {
+                this.container.removeEventListener(type, listener, capture);
+            }
+            this.listeners.clear();
+            this.delegated.clear();
+            this._resetNodes();
+            this.dispatch = null;
+        }
+
+        _forget(node) {
+            if (node.__vid !== undefined) {
+                this.nodes.delete(node.__vid);
+            }
+            for (const child of node.childNodes) {
+                this._forget(child);
+            }
+        }
+    }
+
+    window.VDOMApplier = VDOMApplier;
+})();
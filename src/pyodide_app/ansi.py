@@ -0,0 +1,320 @@
+"""
+Incremental ANSI/VT100 output parser for the virtual terminal.
+
+Turns a stream of text with SGR colour codes, carriage returns and line
+erasures into finished lines of run-length styled segments. A line whose
+text is all in the default style stays a plain ``str``; otherwise it is a
+tuple of ``Segment``s, one per run of identical style, so rendering needs
+one DOM node per run rather than per character.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Style(NamedTuple):
+    fg: Optional[str] = None
+    bg: Optional[str] = None
+    bold: bool = False
+    dim: bool = False
+    italic: bool = False
+    underline: bool = False
+    inverse: bool = False
+
+
+DEFAULT_STYLE = Style()
+
+
+class Segment(NamedTuple):
+    text: str
+    style: Style
+
+
+Line = Union[str, Tuple[Segment, ...]]
+
+# Standard and bright colours (SGR 30-37 / 90-97), VS Code's dark palette.
+PALETTE = (
+    "#000000",
+    "#cd3131",
+    "#0dbc79",
+    "#e5e510",
+    "#2472c8",
+    "#bc3fbc",
+    "#11a8cd",
+    "#e5e5e5",
+    "#666666",
+    "#f14c4c",
+    "#23d18b",
+    "#f5f543",
+    "#3b8eea",
+    "#d670d6",
+    "#29b8db",
+    "#ffffff",
+)
+
+
+def _xterm_color(n: int) -> str:
+    """CSS colour of entry ``n`` of the xterm 256-colour table."""
+    if n < 16:
+        return PALETTE[n]
+    if n < 232:
+        n -= 16
+        levels = [0 if v == 0 else 55 + 40 * v for v in (n // 36, n // 6 % 6, n % 6)]
+        return "#{:02x}{:02x}{:02x}".format(*levels)
+    grey = 8 + 10 * (n - 232)
+    return f"#{grey:02x}{grey:02x}{grey:02x}"
+
+
+@lru_cache(maxsize=256)
+def style_css(style: Style) -> str:
+    """Inline CSS for ``style``; cached since a session uses few styles."""
+    fg, bg = style.fg, style.bg
+    if style.inverse:
+        fg, bg = bg or "var(--term-bg, #1e1e1e)", fg or "var(--term-fg, #d4d4d4)"
+    rules = []
+    if fg:
+        rules.append(f"color:{fg}")
+    if bg:
+        rules.append(f"background:{bg}")
+    if style.bold:
+        rules.append("font-weight:bold")
+    if style.dim:
+        rules.append("opacity:0.7")
+    if style.italic:
+        rules.append("font-style:italic")
+    if style.underline:
+        rules.append("text-decoration:underline")
+    return ";".join(rules)
+
+
+def _apply_sgr(style: Style, params: Sequence[int]) -> Style:
+    """``style`` after the SGR parameters ``params`` (``ESC[...m``)."""
+    i = 0
+    while i < len(params):
+        p = params[i]
+        if p == 0:
+            style = DEFAULT_STYLE
+        elif p == 1:
+            style = style._replace(bold=True)
+        elif p == 2:
+            style = style._replace(dim=True)
+        elif p == 3:
+            style = style._replace(italic=True)
+        elif p == 4:
+            style = style._replace(underline=True)
+        elif p == 7:
+            style = style._replace(inverse=True)
+        elif p == 22:
+            style = style._replace(bold=False, dim=False)
+        elif p == 23:
+            style = style._replace(italic=False)
+        elif p == 24:
+            style = style._replace(underline=False)
+        elif p == 27:
+            style = style._replace(inverse=False)
+        elif 30 <= p <= 37:
+            style = style._replace(fg=PALETTE[p - 30])
+        elif 90 <= p <= 97:
+            style = style._replace(fg=PALETTE[p - 90 + 8])
+        elif 40 <= p <= 47:
+            style = style._replace(bg=PALETTE[p - 40])
+        elif 100 <= p <= 107:
+            style = style._replace(bg=PALETTE[p - 100 + 8])
+        elif p == 39:
+            style = style._replace(fg=None)
+        elif p == 49:
+            style = style._replace(bg=None)
+        elif p in (38, 48) and i + 1 < len(params):
+            color = None
+            if params[i + 1] == 5 and i + 2 < len(params):
+                color = _xterm_color(params[i + 2] & 255)
+                i += 2
+            elif params[i + 1] == 2 and i + 4 < len(params):
+                r, g, b = (v & 255 for v in params[i + 2 : i + 5])
+                color = f"#{r:02x}{g:02x}{b:02x}"
+                i += 4
+            if color is not None:
+                style = (
+                    style._replace(fg=color) if p == 38 else style._replace(bg=color)
+                )
+        i += 1
+    return style
+
+
+# CSI sequences, OSC strings (titles, hyperlinks), charset selection and
+# other two-byte escapes, and the C0 controls that move the cursor.
+_TOKEN = re.compile(
+    r"\x1b\[([0-?]*)[ -/]*([@-~])"
+    r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"
+    r"|\x1b[()*+].?"
+    r"|\x1b[@-Z\\^_=>78]"
+    r"|[\r\n\b]"
+)
+_CONTROLS = re.compile(r"[\x1b\r\b]")
+# A chunk may end in the middle of an escape sequence.
+_INCOMPLETE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?)?\Z")
+# Longest unfinished sequence carried over; anything longer is garbage.
+_MAX_PENDING = 4096
+
+
+class AnsiParser:
+    """Feeds output text in, gets finished styled lines out.
+
+    The line being written stays editable: ``\\r`` moves back to its start
+    so the next text overwrites it in place (progress bars), ``\\b`` moves
+    back one column and ``ESC[K`` erases to the end. ``current`` is that
+    line as it looks now. Style carries over from one line to the next, as
+    on a real terminal. Escape sequences split across ``feed`` calls are
+    completed on the next call; other CSI sequences are dropped.
+    """
+
+    def __init__(self) -> None:
+        self.style = DEFAULT_STYLE
+        self._segments: List[Segment] = []
+        self._length = 0
+        self._col = 0
+        self._pending = ""
+
+    @property
+    def current(self) -> Line:
+        return _freeze(self._segments)
+
+    def feed(self, text: str) -> List[Line]:
+        """Parse ``text``; return the lines it completed."""
+        if self._pending:
+            text = self._pending + text
+            self._pending = ""
+        done: List[Line] = []
+        if (
+            not _CONTROLS.search(text)
+            and self.style == DEFAULT_STYLE
+            and self._col == self._length
+        ):
+            # Plain text appended at the end of the line: no per-token work.
+            parts = text.split("\n")
+            for part in parts[:-1]:
+                self._put(part)
+                done.append(self._newline())
+            self._put(parts[-1])
+            return done
+
+        pos = 0
+        for match in _TOKEN.finditer(text):
+            if match.start() > pos:
+                self._put(text[pos : match.start()])
+            pos = match.end()
+            seq = match.group()
+            if seq == "\n":
+                done.append(self._newline())
+            elif seq == "\r":
+                self._col = 0
+            elif seq == "\b":
+                self._col = max(0, self._col - 1)
+            elif match.group(2) is not None:
+                self._csi(match.group(1), match.group(2))
+        rest = text[pos:]
+        incomplete = _INCOMPLETE.search(rest)
+        if incomplete is not None:
+            if len(incomplete.group()) < _MAX_PENDING:
+                self._pending = incomplete.group()
+            rest = rest[: incomplete.start()]
+        if rest:
+            self._put(rest)
+        return done
+
+    def _csi(self, params: str, command: str) -> None:
+        if command == "m":
+            values = [int(p) if p.isdigit() else 0 for p in params.split(";")]
+            self.style = _apply_sgr(self.style, values)
+        elif command == "K":
+            mode = params or "0"
+            if mode == "0":
+                self._truncate(self._col)
+            elif mode == "2":
+                self._truncate(0)
+        elif command == "G":
+            self._col = max(0, _count(params) - 1)
+        elif command == "D":
+            self._col = max(0, self._col - _count(params))
+        elif command == "C":
+            self._col += _count(params)
+
+    def _put(self, text: str) -> None:
+        if not text:
+            return
+        style = self.style
+        segments = self._segments
+        if self._col > self._length:
+            # Cursor moved right past the end: pad like a terminal would.
+            segments.append(Segment(" " * (self._col - self._length), DEFAULT_STYLE))
+            self._length = self._col
+        if self._col == self._length:
+            if segments and segments[-1].style == style:
+                segments[-1] = Segment(segments[-1].text + text, style)
+            else:
+                segments.append(Segment(text, style))
+            self._length += len(text)
+            self._col = self._length
+            return
+        # Overwrite in place, e.g. a progress bar redrawn after "\r".
+        end = self._col + len(text)
+        head = _slice(segments, 0, self._col)
+        tail = _slice(segments, end, self._length)
+        self._segments = _merge(head + [Segment(text, style)] + tail)
+        self._length = max(self._length, end)
+        self._col = end
+
+    def _truncate(self, col: int) -> None:
+        if col < self._length:
+            self._segments = _slice(self._segments, 0, col)
+            self._length = col
+
+    def _newline(self) -> Line:
+        line = _freeze(self._segments)
+        self._segments = []
+        self._length = 0
+        self._col = 0
+        return line
+
+
+def _count(params: str) -> int:
+    """The repeat count of a cursor movement; 1 when missing."""
+    return int(params) if params.isdigit() and int(params) > 0 else 1
+
+
+def _slice(segments: List[Segment], start: int, stop: int) -> List[Segment]:
+    """The segments covering columns ``start`` to ``stop``."""
+    result = []
+    offset = 0
+    for seg in segments:
+        end = offset + len(seg.text)
+        if end > start and offset < stop:
+            result.append(
+                Segment(seg.text[max(start - offset, 0) : stop - offset], seg.style)
+            )
+        offset = end
+    return result
+
+
+def _merge(segments: List[Segment]) -> List[Segment]:
+    merged: List[Segment] = []
+    for seg in segments:
+        if merged and merged[-1].style == seg.style:
+            merged[-1] = Segment(merged[-1].text + seg.text, seg.style)
+        elif seg.text:
+            merged.append(seg)
+    return merged
+
+
+def _freeze(segments: List[Segment]) -> Line:
+    if all(seg.style == DEFAULT_STYLE for seg in segments):
+        return "".join(seg.text for seg in segments)
+    return tuple(segments)
+
+
+def line_text(line: Line) -> str:
+    """The characters of ``line`` without styling."""
+    if isinstance(line, str):
+        return line
+    return "".join(seg.text for seg in line)
@@ -1,41 +1,45 @@
-from typing import Any
-
-from .core import _GLOBAL_PROXIES, IS_EMSCRIPTEN, keep_alive
-from .reactivity import Signal, observable
-from .vdom import PythonVDOM, h
-
-if IS_EMSCRIPTEN:
-    import js
-else:
-    # Provide a mock for CPython unit testing
-    from unittest.mock import MagicMock
-
-    js = MagicMock()
+from .bindings import BindingTable, bind_to_dom, flush_bindings
+from .core import _GLOBAL_PROXIES, ProxyOwner, keep_alive, leak_report
+from .reactivity import (
+    Computed,
+    ObservableDict,
+    ObservableList,
+    ReactiveProfiler,
+    Signal,
+    async_effect,
+    batch,
+    debounce,
+    effect,
+    observable,
+    throttle,
+)
+from .shared import SharedSignal
+from .vdom import Component, ListView, PythonVDOM, RenderScheduler, VirtualList, h
 
 __all__ = [
     "keep_alive",
     "_GLOBAL_PROXIES",
+    "ProxyOwner",
+    "leak_report",
     "Signal",
+    "Computed",
+    "SharedSignal",
+    "effect",
+    "async_effect",
+    "debounce",
+    "throttle",
+    "batch",
+    "ObservableList",
+    "ObservableDict",
     "observable",
+    "ReactiveProfiler",
     "h",
     "PythonVDOM",
+    "Component",
+    "RenderScheduler",
+    "VirtualList",
+    "ListView",
     "bind_to_dom",
+    "flush_bindings",
+    "BindingTable",
 ]
-
-# --- UI Helpers ---
-
-
-def bind_to_dom(
-    state_obj: Any, field: str, element_id: str, attr: str = "innerText"
-) -> None:
-    """Helper to bind an observable field directly to a DOM element."""
-
-    def update_ui(val: Any) -> None:
-        el = js.document.getElementById(element_id)
-        if el:
-            if attr == "value":
-                el.value = str(val)
-            else:
-                setattr(el, attr, str(val))
-
-    state_obj.subscribe(field, update_ui)
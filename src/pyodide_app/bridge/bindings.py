@@ -0,0 +1,289 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from .core import IS_EMSCRIPTEN
+from .reactivity import DictChange, ListChange, ObservableDict, ObservableList
+from .vdom import FrameClock
+
+if IS_EMSCRIPTEN:
+    import js
+    from pyodide.ffi import create_once_callable
+else:
+    # Provide a mock for CPython unit testing
+    from unittest.mock import MagicMock
+
+    js = MagicMock()
+
+    def create_once_callable(obj: Any) -> Any:
+        return obj
+
+
+# --- DOM Bindings ---
+#
+# ``bind_to_dom`` does not touch the DOM when a bound field changes. The
+# binding only records the new value and is marked dirty; all dirty bindings
+# are written together on the next tick of the table's clock (a microtask by
+# default, so a burst of synchronous writes costs one DOM write per binding).
+# Element handles are looked up once and cached, and a value whose text
+# matches what was last written to the element is skipped.
+
+
+def queue_microtask(callback: Callable[[Any], None]) -> Any:
+    """Default binding clock: run ``callback`` once when the current task ends."""
+    return js.queueMicrotask(create_once_callable(callback))
+
+
+class _ListChildren:
+    """Mirrors an ``ObservableList`` as the child elements of an element."""
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+        # Element handles in list order, so records never query the DOM.
+        self.nodes: List[Any] = []
+
+    def _create(self, value: Any) -> Any:
+        node = js.document.createElement(self.tag)
+        node.textContent = str(value)
+        return node
+
+    def apply(self, el: Any, changes: List[ListChange]) -> None:
+        nodes = self.nodes
+        for change in changes:
+            kind, position = change.kind, change.position
+            if kind == "insert":
+                node = self._create(change.value)
+                before = nodes[position] if position < len(nodes) else None
+                el.insertBefore(node, before)
+                nodes.insert(position, node)
+            elif kind == "remove":
+                nodes.pop(position).remove()
+            elif kind == "set":
+                nodes[position].textContent = str(change.value)
+            elif kind == "move":
+                node = nodes.pop(change.source)
+                before = nodes[position] if position < len(nodes) else None
+                el.insertBefore(node, before)
+                nodes.insert(position, node)
+            elif kind == "reset":
+                el.replaceChildren()
+                nodes.clear()
+                for value in change.value:
+                    node = self._create(value)
+                    el.appendChild(node)
+                    nodes.append(node)
+
+
+class _DictChildren:
+    """Mirrors an ``ObservableDict`` as ``data-key`` children of an element."""
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+        self.nodes: Dict[Any, Any] = {}
+
+    def _set(self, el: Any, key: Any, value: Any) -> None:
+        node = self.nodes.get(key)
+        if node is None:
+            node = js.document.createElement(self.tag)
+            node.setAttribute("data-key", str(key))
+            el.appendChild(node)
+            self.nodes[key] = node
+        node.textContent = str(value)
+
+    def apply(self, el: Any, changes: List[DictChange]) -> None:
+        for change in changes:
+            if change.kind == "set":
+                self._set(el, change.key, change.value)
+            elif change.kind == "delete":
+                self.nodes.pop(change.key).remove()
+            elif change.kind == "reset":
+                el.replaceChildren()
+                self.nodes.clear()
+                for key, value in change.value.items():
+                    self._set(el, key, value)
+
+
+class Binding:
+    """One row of a ``BindingTable``: a field mirrored onto an element."""
+
+    __slots__ = (
+        "element_id",
+        "attr",
+        "item_tag",
+        "element",
+        "value",
+        "last",
+        "children",
+        "records",
+        "dirty",
+        "active",
+        "_stop_field",
+        "_stop_items",
+    )
+
+    def __init__(self, element_id: str, attr: str, item_tag: str) -> None:
+        self.element_id = element_id
+        self.attr = attr
+        self.item_tag = item_tag
+        self.element: Any = None
+        self.value: Any = None
+        # Text last written to the element; None until the first write.
+        self.last: Optional[str] = None
+        # Collection mode: child mirror and the records not yet applied.
+        self.children: Any = None
+        self.records: List[Any] = []
+        self.dirty = False
+        self.active = True
+        self._stop_field: Optional[Callable[[], None]] = None
+        self._stop_items: Optional[Callable[[], None]] = None
+
+
+class BindingTable:
+    """Registry of DOM bindings, flushed together once per clock tick.
+
+    ``clock`` defaults to ``queue_microtask``; pass
+    ``vdom.request_animation_frame`` to write once per frame instead, or a
+    fake clock in CPython tests.
+    """
+
+    def __init__(self, clock: Optional[FrameClock] = None) -> None:
+        self.clock: FrameClock = clock or queue_microtask
+        self.bindings: List[Binding] = []
+        self.flushes = 0
+        self.writes = 0
+        self.skipped = 0
+        self.lookups = 0
+        self._dirty: List[Binding] = []
+        self._scheduled = False
+
+    def bind(
+        self,
+        state_obj: Any,
+        field: str,
+        element_id: str,
+        attr: str = "innerText",
+        item_tag: str = "li",
+    ) -> Callable[[], None]:
+        binding = Binding(element_id, attr, item_tag)
+
+        def on_change(value: Any) -> None:
+            self._on_change(binding, value)
+
+        self.bindings.append(binding)
+        binding._stop_field = state_obj.subscribe(field, on_change)
+        return lambda: self.unbind(binding)
+
+    def unbind(self, binding: Binding) -> None:
+        if not binding.active:
+            return
+        binding.active = False
+        if binding._stop_field is not None:
+            binding._stop_field()
+        if binding._stop_items is not None:
+            binding._stop_items()
+        self.bindings.remove(binding)
+
+    def _on_change(self, binding: Binding, value: Any) -> None:
+        if binding._stop_items is not None:
+            binding._stop_items()
+            binding._stop_items = None
+        if isinstance(value, (ObservableList, ObservableDict)):
+            # Children replace the text, and vice versa below.
+            binding.last = None
+            binding.children = (
+                _ListChildren(binding.item_tag)
+                if isinstance(value, ObservableList)
+                else _DictChildren(binding.item_tag)
+            )
+            binding.records = []
+
+            def on_records(changes: List[Any]) -> None:
+                binding.records.extend(changes)
+                self._mark(binding)
+
+            # Delivers a "reset" record right away.
+            binding._stop_items = value.subscribe(on_records)
+        else:
+            if binding.children is not None:
+                binding.last = None
+                binding.children = None
+            binding.value = value
+            self._mark(binding)
+
+    def _mark(self, binding: Binding) -> None:
+        if not binding.dirty:
+            binding.dirty = True
+            self._dirty.append(binding)
+        if not self._scheduled:
+            self._scheduled = True
+            self.clock(self._on_tick)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._dirty)
+
+    def _on_tick(self, timestamp: Any = None) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """Write every dirty binding to the DOM now."""
+        self._scheduled = False
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, []
+        self.flushes += 1
+        for binding in dirty:
+            binding.dirty = False
+            if binding.active:
+                self._write(binding)
+
+    def _write(self, binding: Binding) -> None:
+        el = binding.element
+        if el is None:
+            self.lookups += 1
+            el = binding.element = js.document.getElementById(binding.element_id)
+            if not el:
+                # Not in the document (yet); look it up again next time.
+                binding.element = None
+                return
+
+        if binding.children is not None:
+            records, binding.records = binding.records, []
+            binding.children.apply(el, records)
+            return
+
+        text = str(binding.value)
+        attr = binding.attr
+        # Inputs can be edited by the user, so compare with the live value.
+        last = el.value if attr == "value" else binding.last
+        if text == last:
+            self.skipped += 1
+            return
+        setattr(el, attr, text)
+        binding.last = text
+        self.writes += 1
+
+
+default_bindings = BindingTable()
+
+
+def bind_to_dom(
+    state_obj: Any,
+    field: str,
+    element_id: str,
+    attr: str = "innerText",
+    item_tag: str = "li",
+) -> Callable[[], None]:
+    """Helper to bind an observable field directly to a DOM element.
+
+    Writes are coalesced by ``default_bindings`` and applied on the next
+    microtask. If the field holds an ``ObservableList`` or
+    ``ObservableDict`` the element gets one ``item_tag`` child per item
+    (dict children carry a ``data-key`` attribute), and each change record
+    patches only the affected child. Returns a function that removes the
+    binding again.
+    """
+    return default_bindings.bind(state_obj, field, element_id, attr, item_tag)
+
+
+def flush_bindings() -> None:
+    """Apply pending ``bind_to_dom`` writes immediately instead of next tick."""
+    default_bindings.flush()
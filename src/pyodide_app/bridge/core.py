@@ -1,18 +1,158 @@
 import sys
-from typing import Any, List
+from collections import Counter
+from typing import Any, Dict, List, Optional
 
 # Environment detection
 IS_EMSCRIPTEN = sys.platform == "emscripten"
 
+if IS_EMSCRIPTEN:
+    from pyodide.ffi import create_proxy
+else:
+
+    def create_proxy(obj: Any) -> Any:
+        return obj  # Return original object in CPython for logic testing
+
+
 # --- GC Management ---
 
 _GLOBAL_PROXIES: List[Any] = []
 
 
+def _caller_site(depth: int) -> str:
+    """``file:line`` of the frame ``depth`` levels above the caller."""
+    try:
+        frame = sys._getframe(depth + 1)
+    except ValueError:
+        return "<unknown>"
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+class ProxyOwner:
+    """Owns a group of PyProxies and destroys them together.
+
+    Give each component, page section or long-running task its own owner and
+    call ``destroy()`` when it goes away (or use it as a context manager), so
+    its event listeners and callbacks stop pinning memory in the WASM heap.
+    Owners can be nested: destroying a parent destroys its children.
+
+    Every adopted proxy is recorded with the ``file:line`` that created it,
+    which ``leak_report()`` aggregates across all live owners.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        parent: Optional["ProxyOwner"] = None,
+        proxies: Optional[List[Any]] = None,
+    ) -> None:
+        self.name = name or f"owner-{id(self):x}"
+        self.proxies: List[Any] = proxies if proxies is not None else []
+        self.sites: List[str] = []
+        self.children: List[ProxyOwner] = []
+        self.parent = parent
+        self.destroyed = False
+        if parent is not None:
+            parent.children.append(self)
+        _LIVE_OWNERS[id(self)] = self
+
+    @property
+    def live(self) -> int:
+        """Proxies held by this owner and all of its children."""
+        return len(self.proxies) + sum(child.live for child in self.children)
+
+    def child(self, name: str = "") -> "ProxyOwner":
+        return ProxyOwner(f"{self.name}/{name}" if name else "", parent=self)
+
+    def adopt(self, proxy: Any, _depth: int = 1) -> Any:
+        """Take ownership of ``proxy`` and return it."""
+        if self.destroyed:
+            raise RuntimeError(f"ProxyOwner {self.name!r} has already been destroyed")
+        self.proxies.append(proxy)
+        self.sites.append(_caller_site(_depth))
+        return proxy
+
+    def create(self, obj: Any) -> Any:
+        """``create_proxy(obj)``, owned by this owner."""
+        return self.adopt(create_proxy(obj), _depth=2)
+
+    def release(self, proxy: Any) -> None:
+        """Destroy a single owned proxy ahead of the rest."""
+        for index, owned in enumerate(self.proxies):
+            if owned is proxy:
+                del self.proxies[index]
+                if index < len(self.sites):
+                    del self.sites[index]
+                _destroy(proxy)
+                return
+
+    def destroy(self) -> None:
+        """Destroy every owned proxy, children first, and retire the owner."""
+        for child in list(self.children):
+            child.destroy()
+        for proxy in self.proxies:
+            _destroy(proxy)
+        self.proxies.clear()
+        self.sites.clear()
+        self.destroyed = True
+        _LIVE_OWNERS.pop(id(self), None)
+        if self.parent is not None and self in self.parent.children:
+            self.parent.children.remove(self)
+
+    def __enter__(self) -> "ProxyOwner":
+        _OWNER_STACK.append(self)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _OWNER_STACK.remove(self)
+        self.destroy()
+
+
+def _destroy(proxy: Any) -> None:
+    destroy = getattr(proxy, "destroy", None)
+    if destroy is not None:
+        try:
+            destroy()
+        except Exception as e:
+            # Already destroyed from the JS side; nothing left to free.
+            print(f"Warning: could not destroy proxy: {e}")
+
+
+# Owners that have not been destroyed yet, for leak reports.
+_LIVE_OWNERS: Dict[int, ProxyOwner] = {}
+
+# Innermost ``with owner:`` block last; keep_alive() adopts into it.
+_OWNER_STACK: List[ProxyOwner] = []
+
+# Owner of everything kept alive outside any scope. Its storage is the
+# historical ``_GLOBAL_PROXIES`` list, which is never freed.
+GLOBAL_OWNER = ProxyOwner("global", proxies=_GLOBAL_PROXIES)
+
+
+def current_owner() -> ProxyOwner:
+    return _OWNER_STACK[-1] if _OWNER_STACK else GLOBAL_OWNER
+
+
 def keep_alive(proxy: Any) -> Any:
     """
     Prevents a PyProxy from being garbage collected by storing it in a global list.
     Use this for event listeners or components that must persist.
+
+    Inside a ``with ProxyOwner(...):`` block the proxy belongs to that owner
+    instead and is destroyed when the block exits.
     """
-    _GLOBAL_PROXIES.append(proxy)
-    return proxy
+    return current_owner().adopt(proxy, _depth=2)
+
+
+def leak_report() -> Dict[str, Any]:
+    """Live proxy counts per owner and per creation site."""
+    owners: Dict[str, int] = {}
+    sites: Counter = Counter()
+    for owner in _LIVE_OWNERS.values():
+        if owner.proxies:
+            owners[owner.name] = owners.get(owner.name, 0) + len(owner.proxies)
+        sites.update(owner.sites)
+    return {
+        "total": sum(owners.values()),
+        "owners": owners,
+        "sites": dict(sites.most_common()),
+    }
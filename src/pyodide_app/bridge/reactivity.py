@@ -1,59 +1,1340 @@
-from typing import Any, Callable, Generic, List, TypeVar
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    overload,
+)
 
 T = TypeVar("T")
 
+# --- Dependency Tracking ---
+#
+# Signals are the sources of a dependency graph whose other nodes are
+# ``Computed`` values and effects. A computation records every signal or
+# computed it reads while running; a write then marks its direct observers
+# dirty and everything further downstream as "check". Effects reached by the
+# marking are queued and pulled in order: a node in the check state first
+# refreshes its computed sources and only re-runs if one of them actually
+# changed. Each node therefore recomputes at most once per write, always
+# after all of its inputs, and computeds nobody reads are never evaluated.
+
+_CLEAN, _CHECK, _DIRTY = 0, 1, 2
+
+# The computation currently collecting dependencies, if any.
+_observer: Optional["_Computation"] = None
+
+_pending_effects: List["Effect"] = []
+_flushing = False
+
+
+def _mark(observers: List["_Computation"], state: int) -> None:
+    for obs in observers:
+        if obs._state < state:
+            if obs._state == _CLEAN and isinstance(obs, Effect):
+                _pending_effects.append(obs)
+            obs._state = state
+            if obs._observers:
+                _mark(obs._observers, _CHECK)
+
+
+def _run_effects() -> None:
+    global _flushing
+    if _flushing:
+        # An effect wrote a signal; the outer loop picks the new work up.
+        return
+    _flushing = True
+    error: Optional[Exception] = None
+    try:
+        while _pending_effects:
+            queue = _pending_effects[:]
+            del _pending_effects[:]
+            for effect in queue:
+                try:
+                    effect._refresh()
+                except Exception as e:
+                    # A failing effect must neither starve the rest of the
+                    # queue nor stay marked, or ``_mark`` never queues it again.
+                    effect._state = _CLEAN
+                    if error is None:
+                        error = e
+    finally:
+        _flushing = False
+    if error is not None:
+        raise error
+
+
+# --- Equality Policies ---
+#
+# A write whose new value is "equal" to the current one is dropped without
+# notifying anybody. The policy is chosen per signal, computed or observable
+# field; any ``(old, new) -> bool`` callable works.
+
+Equals = Callable[[Any, Any], bool]
+
+
+def identical(old: Any, new: Any) -> bool:
+    """Only the very same object counts as unchanged."""
+    return old is new
+
+
+def equal(old: Any, new: Any) -> bool:
+    """Identity or ``==`` (the default). Uncomparable values count as changed."""
+    if old is new:
+        return True
+    try:
+        return bool(old == new)
+    except Exception:
+        return False
+
+
+def never_equal(old: Any, new: Any) -> bool:
+    """Notify on every write, like a plain event."""
+    return False
+
+
+class NotifyStats:
+    """Counts writes that notified versus writes suppressed as unchanged."""
+
+    def __init__(self) -> None:
+        self.notified = 0
+        self.suppressed = 0
+
+    @property
+    def suppression_rate(self) -> float:
+        total = self.notified + self.suppressed
+        return self.suppressed / total if total else 0.0
+
+    def reset(self) -> None:
+        self.notified = 0
+        self.suppressed = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "notified": self.notified,
+            "suppressed": self.suppressed,
+            "suppression_rate": self.suppression_rate,
+        }
+
+
+# Aggregated over every signal and observable field.
+NOTIFY_STATS = NotifyStats()
+
+
+# --- Subscriptions ---
+#
+# Subscriber collections are tuples that are replaced, never mutated, on
+# subscribe/unsubscribe. Notification loops iterate whatever tuple was
+# current when they started, which costs no allocation and stays correct
+# when a callback unsubscribes itself or others mid-loop.
+
+# Coroutine functions are accepted too; see ``AsyncSubscriber``.
+Subscriber = Callable[[Any], Any]
+
+_MISSING = object()
+
+
+class _WeakSubscriber:
+    """Calls ``callback`` through a weak reference.
+
+    Bound methods are held with ``WeakMethod`` so the subscription does not
+    keep their instance alive. ``on_dead`` runs once the target is gone.
+    """
+
+    __slots__ = ("ref", "__weakref__")
+
+    def __init__(self, callback: Subscriber, on_dead: Callable[[Any], None]) -> None:
+        this = weakref.ref(self)
+
+        def dead(_: Any) -> None:
+            entry = this()
+            if entry is not None:
+                on_dead(entry)
+
+        self.ref: Callable[[], Optional[Subscriber]]
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self.ref = weakref.WeakMethod(callback, dead)  # type: ignore[arg-type]
+        else:
+            self.ref = weakref.ref(callback, dead)
+
+    def __call__(self, value: Any) -> None:
+        callback = self.ref()
+        if callback is not None:
+            callback(value)
+
+
+def _without(subscribers: Tuple[Subscriber, ...], entry: Any) -> Tuple[Any, ...]:
+    return tuple(cb for cb in subscribers if cb is not entry)
+
+
+# --- Async Subscribers ---
+#
+# A coroutine function passed to ``subscribe`` is wrapped in an
+# ``AsyncSubscriber``: each notification starts the coroutine as a task on
+# the asyncio loop (Pyodide's ``WebLoop`` in the browser) and cancels the
+# run still in flight for an older value, so only the latest value's result
+# lands. ``debounce`` and ``throttle`` additionally limit how often runs
+# start at all.
+
+
+class AsyncSubscriber:
+    """Runs ``fn(value)`` as an asyncio task for the latest value only.
+
+    With ``debounce=seconds`` a run starts once no new value has arrived for
+    that long. With ``throttle=seconds`` the first value runs at once and
+    later ones at most once per interval, always with the newest value.
+    Without either, every value starts a run immediately. In all modes the
+    previous run is cancelled when the next one starts; a debounced
+    subscriber also cancels it as soon as a newer value arrives, since its
+    result would be stale anyway.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        if debounce is not None and throttle is not None:
+            raise ValueError("Use either debounce or throttle, not both")
+        self._fn = fn
+        self._debounce = debounce
+        self._throttle = throttle
+        self._loop = loop
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending: Any = _MISSING
+        self._next_start = 0.0
+        # Set by ``async_effect``: the effect feeding this subscriber.
+        self._effect: Optional[Effect] = None
+        self.task: Optional[asyncio.Task[Any]] = None
+        self.disposed = False
+        self.runs = 0
+        self.cancelled = 0
+        self.dropped = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The loop runs are scheduled on: ``loop`` or the running one.
+
+        Pyodide's loop is always running. Elsewhere a coroutine subscriber
+        must be created inside a running loop, or be given ``loop``, since
+        tasks created on a loop nobody runs would never start.
+        """
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise RuntimeError(
+                    "Coroutine subscribers need a running asyncio event loop; "
+                    "subscribe from a coroutine or pass loop="
+                ) from None
+        return self._loop
+
+    def __call__(self, value: Any) -> None:
+        if self.disposed:
+            return
+        if self._debounce is not None:
+            self._cancel_task()
+            self._defer(value, self._debounce)
+        elif self._throttle is not None:
+            wait = self._next_start - self.loop.time()
+            if wait > 0 or self._timer is not None:
+                self._defer(value, max(wait, 0.0))
+            else:
+                self._start(value)
+        else:
+            self._start(value)
+
+    def _defer(self, value: Any, delay: float) -> None:
+        if self._pending is not _MISSING:
+            self.dropped += 1
+        self._pending = value
+        if self._timer is not None:
+            if self._throttle is not None:
+                # The trailing run is already scheduled; it picks up the
+                # newest pending value.
+                return
+            self._timer.cancel()
+        self._timer = self.loop.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        value, self._pending = self._pending, _MISSING
+        if value is not _MISSING and not self.disposed:
+            self._start(value)
+
+    def _start(self, value: Any) -> None:
+        self._cancel_task()
+        if self._throttle is not None:
+            self._next_start = self.loop.time() + self._throttle
+        self.task = self.loop.create_task(self._run(value))
+
+    async def _run(self, value: Any) -> None:
+        try:
+            await self._fn(value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.loop.call_exception_handler(
+                {"message": f"Async subscriber {self._fn!r} failed", "exception": e}
+            )
+        else:
+            self.runs += 1
+
+    def _cancel_task(self) -> None:
+        task = self.task
+        if task is not None and not task.done():
+            task.cancel()
+            self.cancelled += 1
+        self.task = None
+
+    def dispose(self) -> None:
+        """Drop the pending value and cancel the run in flight."""
+        self.disposed = True
+        if self._effect is not None:
+            self._effect.dispose()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = _MISSING
+        self._cancel_task()
+
+
+def debounce(seconds: float, fn: Callable[[Any], Awaitable[Any]]) -> AsyncSubscriber:
+    """Subscriber that runs ``fn`` once values stop arriving for ``seconds``."""
+    return AsyncSubscriber(fn, debounce=seconds)
+
+
+def throttle(seconds: float, fn: Callable[[Any], Awaitable[Any]]) -> AsyncSubscriber:
+    """Subscriber that runs ``fn`` at most once per ``seconds``."""
+    return AsyncSubscriber(fn, throttle=seconds)
+
+
+def _subscriber(
+    callback: Callable[[Any], Any], weak: bool, on_dead: Callable[[Any], None]
+) -> Subscriber:
+    """The entry stored for ``callback`` in a subscriber tuple."""
+    if inspect.iscoroutinefunction(callback):
+        if weak:
+            raise ValueError("Weak subscriptions need a synchronous callback")
+        callback = AsyncSubscriber(callback)
+    if isinstance(callback, AsyncSubscriber):
+        # Resolve the loop now, so a missing one fails before registering.
+        if callback.loop.is_closed():
+            raise RuntimeError("The event loop of this subscriber is closed")
+        return callback
+    return _WeakSubscriber(callback, on_dead) if weak else callback
+
+
+def _disposer(
+    unsubscribe: Callable[[Any], None], entry: Subscriber
+) -> Callable[[], None]:
+    if isinstance(entry, AsyncSubscriber):
+
+        def dispose() -> None:
+            unsubscribe(entry)
+            entry.dispose()
+
+        return dispose
+    return lambda: unsubscribe(entry)
+
+
+# --- Batching ---
+#
+# Inside ``batch()`` writes still update values (and mark the dependency
+# graph, so computeds read in the batch are current) but subscriber
+# callbacks and effects are deferred. Each signal or observable field is
+# queued once, in first-write order, and notified with its final value when
+# the outermost batch exits, unless that value equals the one it had before
+# the batch.
+
+_batch_depth = 0
+# (id(owner), field or None for signals and collections)
+#   -> (owner, field, value before the batch, equality policy or None)
+_deferred: Dict[
+    Tuple[int, Optional[str]], Tuple[Any, Optional[str], Any, Optional[Equals]]
+] = {}
+
+
+def _defer(
+    owner: Any, name: Optional[str], before: Any, equals: Optional[Equals]
+) -> None:
+    """Queue ``owner`` for the batch flush; keeps the first write's old value."""
+    key = (id(owner), name)
+    if key not in _deferred:
+        _deferred[key] = (owner, name, before, equals)
+
+
+def _flush_batch() -> None:
+    error: Optional[Exception] = None
+    try:
+        while _deferred:
+            pending = list(_deferred.values())
+            _deferred.clear()
+            for owner, name, before, equals in pending:
+                if equals is not None:
+                    final = owner._value if name is None else getattr(owner, name)
+                    if equals(before, final):
+                        # Changed and changed back within the batch.
+                        continue
+                try:
+                    if name is None:
+                        owner._run_subscribers()
+                    else:
+                        _notify_field(owner, name)
+                except Exception as e:
+                    # Like ``_run_effects``: deliver everything, then raise.
+                    if error is None:
+                        error = e
+    finally:
+        _run_effects()
+    if error is not None:
+        raise error
+
+
+@contextmanager
+def _batching() -> Iterator[None]:
+    global _batch_depth
+    _batch_depth += 1
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if not _batch_depth:
+            _flush_batch()
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@overload
+def batch() -> ContextManager[None]: ...
+
+
+@overload
+def batch(fn: F) -> F: ...
+
+
+def batch(fn: Optional[Callable[..., Any]] = None) -> Any:
+    """Defer and coalesce notifications until the block or call finishes.
+
+    Use as ``with batch():`` or as a ``@batch`` decorator. Batches nest;
+    only the outermost one flushes.
+    """
+    if fn is None:
+        return _batching()
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _batching():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
 # --- Reactive Signals ---
 
 
 class Signal(Generic[T]):
-    """A fine-grained reactive signal."""
+    """A fine-grained reactive signal.
+
+    Writes that ``equals`` the current value are ignored and counted in
+    ``suppressed``.
+    """
 
-    def __init__(self, value: T):
+    def __init__(self, value: T, equals: Equals = equal, name: str = ""):
         self._value: T = value
-        self._subscribers: List[Callable[[T], None]] = []
+        # Shown by ``ReactiveProfiler``; unnamed signals are listed by id.
+        self.name = name
+        self._equals = equals
+        self._subscribers: Tuple[Subscriber, ...] = ()
+        # Computeds and effects that read this signal.
+        self._observers: List[_Computation] = []
+        self.suppressed = 0
 
     @property
     def value(self) -> T:
+        if _observer is not None:
+            _observer._track(self)
         return self._value
 
     @value.setter
     def value(self, new_value: T):
+        old = self._value
+        if self._equals(old, new_value):
+            self.suppressed += 1
+            NOTIFY_STATS.suppressed += 1
+            return
         self._value = new_value
-        self._notify()
+        NOTIFY_STATS.notified += 1
+        self._notify(old)
+
+    def peek(self) -> T:
+        """Read the value without registering a dependency."""
+        return self._value
+
+    def subscribe(
+        self, callback: Callable[[T], Any], weak: bool = False
+    ) -> Callable[[], None]:
+        """Call ``callback`` now and on every change; returns a disposer.
 
-    def subscribe(self, callback: Callable[[T], None]) -> None:
-        self._subscribers.append(callback)
-        callback(self._value)
+        With ``weak=True`` only a weak reference is kept and the
+        subscription ends by itself once ``callback`` (or, for a bound
+        method, its instance) is garbage collected. A coroutine function is
+        run as an ``AsyncSubscriber``; the disposer also cancels its run.
+        """
+        entry = _subscriber(callback, weak, self._unsubscribe)
+        self._subscribers = self._subscribers + (entry,)
+        entry(self._value)
+        return _disposer(self._unsubscribe, entry)
 
-    def _notify(self) -> None:
+    def _unsubscribe(self, entry: Subscriber) -> None:
+        self._subscribers = _without(self._subscribers, entry)
+
+    def _notify(self, old: T) -> None:
+        if _batch_depth:
+            _defer(self, None, old, self._equals)
+            if self._observers:
+                _mark(self._observers, _DIRTY)
+            return
+        # Mark first so a raising subscriber cannot leave computeds stale.
+        if not self._observers:
+            self._run_subscribers()
+            return
+        _mark(self._observers, _DIRTY)
+        try:
+            self._run_subscribers()
+        finally:
+            _run_effects()
+
+    def _run_subscribers(self) -> None:
         for cb in self._subscribers:
             cb(self._value)
 
 
+class _Computation:
+    """Shared bookkeeping of ``Computed`` and ``Effect``."""
+
+    def __init__(self, fn: Callable[[], Any]) -> None:
+        self._fn = fn
+        # Signals, computeds and observable collections read by the last run.
+        self._sources: List[Any] = []
+        self._observers: List[_Computation] = []
+        self._state = _DIRTY
+        self._running = False
+
+    def _track(self, source: Any) -> None:
+        if source not in self._sources:
+            self._sources.append(source)
+            if self not in source._observers:
+                source._observers.append(self)
+
+    def _execute(self) -> Any:
+        """Run ``fn`` while recording what it reads."""
+        global _observer
+        if self._running:
+            raise RuntimeError("Cycle detected in reactive graph")
+        previous = self._sources
+        self._sources = []
+        outer, _observer = _observer, self
+        self._running = True
+        try:
+            return self._fn()
+        finally:
+            self._running = False
+            _observer = outer
+            for source in previous:
+                if source not in self._sources:
+                    source._observers.remove(self)
+
+    def _refresh(self) -> None:
+        """Bring this node up to date, re-running it only if needed."""
+        if self._state == _CHECK:
+            for source in self._sources:
+                if isinstance(source, Computed):
+                    source._refresh()
+                    if self._state == _DIRTY:
+                        break
+        if self._state == _DIRTY:
+            self._update()
+        self._state = _CLEAN
+
+    def _update(self) -> None:
+        raise NotImplementedError
+
+    def _detach(self) -> None:
+        for source in self._sources:
+            source._observers.remove(self)
+        self._sources = []
+
+
+class Computed(_Computation, Generic[T]):
+    """A value derived from other signals, cached until one of them changes.
+
+    ``fn`` is not called until ``value`` is first read, and afterwards only
+    when a signal it read during its last run has been written. Reading a
+    computed from an effect or another computed tracks it like a signal.
+    """
+
+    def __init__(self, fn: Callable[[], T], equals: Equals = equal) -> None:
+        super().__init__(fn)
+        self._value: Optional[T] = None
+        self._equals = equals
+        self.recomputes = 0
+
+    @property
+    def value(self) -> T:
+        if self._state != _CLEAN:
+            self._refresh()
+        if _observer is not None:
+            _observer._track(self)
+        return self._value  # type: ignore[return-value]
+
+    def peek(self) -> T:
+        """Read the (refreshed) value without registering a dependency."""
+        if self._state != _CLEAN:
+            self._refresh()
+        return self._value  # type: ignore[return-value]
+
+    def _update(self) -> None:
+        old = self._value
+        new = self._execute()
+        self.recomputes += 1
+        if self.recomputes == 1 or not self._equals(old, new):
+            self._value = new
+            # Direct observers were only marked "check"; now they must run.
+            for obs in self._observers:
+                obs._state = _DIRTY
+        else:
+            NOTIFY_STATS.suppressed += 1
+
+
+class Effect(_Computation):
+    """A side effect re-run whenever a signal it read changes."""
+
+    def __init__(self, fn: Callable[[], Any]) -> None:
+        super().__init__(fn)
+        self.disposed = False
+        self.runs = 0
+
+    def _update(self) -> None:
+        if not self.disposed:
+            self._execute()
+            self.runs += 1
+
+    def dispose(self) -> None:
+        """Stop re-running and release the tracked dependencies."""
+        self.disposed = True
+        self._detach()
+
+
+def effect(fn: Callable[[], Any]) -> Effect:
+    """Run ``fn`` now and again whenever a signal it read changes.
+
+    Usable as a decorator. Call ``dispose()`` on the result to stop it.
+    """
+    eff = Effect(fn)
+    eff._refresh()
+    return eff
+
+
+def async_effect(
+    source: Callable[[], T],
+    fn: Callable[[T], Awaitable[Any]],
+    debounce: Optional[float] = None,
+    throttle: Optional[float] = None,
+) -> AsyncSubscriber:
+    """Run coroutine ``fn`` with the value of ``source()`` now and on changes.
+
+    ``source`` is tracked like an effect; only it is, since dependencies
+    read after an ``await`` cannot be attributed to the run. Runs are
+    scheduled by an ``AsyncSubscriber`` (stale runs are cancelled) with the
+    given ``debounce`` or ``throttle``. ``dispose()`` on the result stops
+    tracking as well.
+    """
+    runner = AsyncSubscriber(fn, debounce=debounce, throttle=throttle)
+    runner._effect = effect(lambda: runner(source()))
+    return runner
+
+
 # --- Observable Dataclasses ---
+#
+# ``@observable`` does not override ``__setattr__``. The first time a field
+# of a class is subscribed, an ``_ObservedField`` descriptor is installed for
+# that field on the class. Writes to fields nobody has ever observed remain
+# plain attribute writes. Fields without a class-level default get a
+# descriptor that only defines ``__set__`` and ``__delete__``, so reads go
+# straight to the instance dict. A field with a default (a dataclass default
+# or a plain class attribute) keeps it readable through ``__get__``.
 
 
-def observable(cls: Any) -> Any:
-    """Decorator that adds subscription capabilities to a class."""
-    orig_init = cls.__init__
+def _notify_field(obj: Any, name: str) -> None:
+    callbacks = obj._subscribers.get(name)
+    if callbacks:
+        value = getattr(obj, name)
+        for cb in callbacks:
+            cb(value)
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: N807
-        object.__setattr__(self, "_subscribers", {})
-        orig_init(self, *args, **kwargs)
 
-    def subscribe(self, field_name: str, callback: Callable[[Any], None]) -> None:
-        if field_name not in self._subscribers:
-            self._subscribers[field_name] = []
-        self._subscribers[field_name].append(callback)
-        callback(getattr(self, field_name))
+class _ObservedField:
+    """Notifies the subscribers of one field when it is written."""
 
-    def __setattr__(self, name: str, value: Any) -> None:  # noqa: N807
-        object.__setattr__(self, name, value)
-        if hasattr(self, "_subscribers") and name in self._subscribers:
-            for cb in self._subscribers[name]:
+    __slots__ = ("name", "equals")
+
+    def __init__(self, name: str, equals: Equals) -> None:
+        self.name = name
+        self.equals = equals
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        callbacks = self._store(obj, value)
+        if callbacks:
+            for cb in callbacks:
                 cb(value)
 
-    cls.__init__ = __init__
+    def __delete__(self, obj: Any) -> None:
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def _store(self, obj: Any, value: Any) -> Optional[Tuple[Subscriber, ...]]:
+        """Write ``value``; return the callbacks to notify right now, if any.
+
+        Nothing is returned for unobserved fields, unchanged values and
+        writes inside a batch (which are queued for the flush instead).
+        """
+        state = obj.__dict__
+        name = self.name
+        subscribers = obj._subscribers
+        callbacks = subscribers.get(name) if subscribers else None
+        if not callbacks:
+            state[name] = value
+            return None
+        old = getattr(obj, name)
+        if self.equals(old, value):
+            NOTIFY_STATS.suppressed += 1
+            return None
+        state[name] = value
+        NOTIFY_STATS.notified += 1
+        if _batch_depth:
+            _defer(obj, name, old, self.equals)
+            return None
+        return callbacks
+
+
+class _ObservedDefaultField(_ObservedField):
+    """``_ObservedField`` over a plain class attribute holding a default."""
+
+    __slots__ = ("default",)
+
+    def __init__(self, name: str, equals: Equals, default: Any) -> None:
+        super().__init__(name, equals)
+        self.default = default
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self.default
+        return obj.__dict__.get(self.name, self.default)
+
+
+def _observe_field(cls: Any, name: str, equals: Equals) -> None:
+    """Install the write hook for ``name`` on ``cls`` if it is not there yet."""
+    current = inspect.getattr_static(cls, name, _MISSING)
+    if isinstance(current, _ObservedField):
+        return
+    if current is _MISSING:
+        # No default to preserve (e.g. a ``default_factory`` or required
+        # dataclass field, or an attribute only ever set on instances).
+        setattr(cls, name, _ObservedField(name, equals))
+    elif hasattr(type(current), "__set__"):
+        raise TypeError(f"Cannot observe {cls.__name__}.{name}: it is a descriptor")
+    else:
+        setattr(cls, name, _ObservedDefaultField(name, equals, current))
+
+
+def observable(cls: Any = None, *, equals: Equals = equal) -> Any:
+    """Decorator that adds subscription capabilities to a class.
+
+    ``equals`` is the default change policy of every field; dataclass fields
+    can override it with ``field(metadata={"equals": identical})``. Writes
+    to a subscribed field that do not change it notify nobody.
+    """
+    if cls is None:
+        return functools.partial(observable, equals=equals)
+
+    policies: Dict[str, Equals] = {}
+    if dataclasses.is_dataclass(cls):
+        for f in dataclasses.fields(cls):
+            policies[f.name] = f.metadata.get("equals", equals)
+
+    def subscribe(
+        self, field_name: str, callback: Subscriber, weak: bool = False
+    ) -> Callable[[], None]:
+        subscribers = self._subscribers
+        if subscribers is None:
+            subscribers = self._subscribers = {}
+
+        def unsubscribe(entry: Subscriber) -> None:
+            remaining = _without(subscribers.get(field_name, ()), entry)
+            if remaining:
+                subscribers[field_name] = remaining
+            else:
+                # Unobserved fields go back to skipping notification.
+                subscribers.pop(field_name, None)
+
+        _observe_field(type(self), field_name, policies.get(field_name, equals))
+        entry = _subscriber(callback, weak, unsubscribe)
+        subscribers[field_name] = subscribers.get(field_name, ()) + (entry,)
+        entry(getattr(self, field_name))
+        return _disposer(unsubscribe, entry)
+
+    # Per-instance subscriber table, created on the first subscription.
+    cls._subscribers = None
     cls.subscribe = subscribe
-    cls.__setattr__ = __setattr__
     return cls
+
+
+# --- Reactive Collections ---
+#
+# ``ObservableList`` and ``ObservableDict`` describe each mutation with a
+# change record instead of handing subscribers the whole value, so a bound
+# view can patch only the affected rows. Subscribers receive a list of
+# records: one per mutation, or everything written during a ``batch()``.
+# The first delivery, on ``subscribe``, is a single ``"reset"`` record with
+# the current contents. Reading a collection inside a computed or effect
+# tracks it like a signal.
+
+
+class ListChange(NamedTuple):
+    """One mutation of an ``ObservableList``.
+
+    ``kind`` is ``"insert"``, ``"remove"`` or ``"set"`` of ``value`` at
+    ``position``; ``"move"`` of ``value`` from ``source`` to ``position``
+    (counted after removal); or ``"reset"`` to ``value``, a list of all items.
+    """
+
+    kind: str
+    position: int
+    value: Any
+    source: int = -1
+
+
+class DictChange(NamedTuple):
+    """One mutation of an ``ObservableDict``.
+
+    ``kind`` is ``"set"`` or ``"delete"`` of ``key``, or ``"reset"`` to
+    ``value``, a dict of all entries (``key`` is ``None``).
+    """
+
+    kind: str
+    key: Any
+    value: Any
+
+
+class _ObservableCollection:
+    """Subscriptions and change delivery shared by the collections."""
+
+    def __init__(self, equals: Equals = equal) -> None:
+        self._equals = equals
+        self._subscribers: Tuple[Subscriber, ...] = ()
+        self._observers: List[_Computation] = []
+        self._changes: List[Any] = []
+
+    def subscribe(self, callback: Subscriber, weak: bool = False) -> Callable[[], None]:
+        """Call ``callback`` with change records; returns a disposer."""
+        entry = _subscriber(callback, weak, self._unsubscribe)
+        self._subscribers = self._subscribers + (entry,)
+        entry([self._reset_record()])
+        return _disposer(self._unsubscribe, entry)
+
+    def _unsubscribe(self, entry: Subscriber) -> None:
+        self._subscribers = _without(self._subscribers, entry)
+
+    def _reset_record(self) -> Any:
+        raise NotImplementedError
+
+    def _read(self) -> None:
+        if _observer is not None:
+            _observer._track(self)
+
+    def _emit(self, change: Any) -> None:
+        NOTIFY_STATS.notified += 1
+        if self._subscribers:
+            self._changes.append(change)
+        if _batch_depth:
+            if self._subscribers:
+                # Records are always delivered; there is no value to compare.
+                _defer(self, None, None, None)
+            if self._observers:
+                _mark(self._observers, _DIRTY)
+            return
+        # Mark first so a raising subscriber cannot leave computeds stale.
+        if not self._observers:
+            self._run_subscribers()
+            return
+        _mark(self._observers, _DIRTY)
+        try:
+            self._run_subscribers()
+        finally:
+            _run_effects()
+
+    def _run_subscribers(self) -> None:
+        changes = self._take_changes()
+        if changes:
+            for cb in self._subscribers:
+                cb(changes)
+
+    def _take_changes(self) -> List[Any]:
+        """The records queued since the last delivery; clears the queue."""
+        changes, self._changes = self._changes, []
+        return changes
+
+
+class ObservableList(_ObservableCollection, MutableSequence):
+    """A list that reports inserts, removals, moves and replacements.
+
+    Compares by identity like a ``Signal``; use ``list(items)`` to compare
+    contents.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), equals: Equals = equal) -> None:
+        super().__init__(equals)
+        self._items: List[Any] = list(items)
+
+    def __repr__(self) -> str:
+        return f"ObservableList({self._items!r})"
+
+    def __len__(self) -> int:
+        self._read()
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._read()
+        return iter(self._items)
+
+    def __getitem__(self, index: Any) -> Any:
+        self._read()
+        return self._items[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            self._items[index] = value
+            self._emit(self._reset_record())
+            return
+        index = range(len(self._items))[index]
+        if self._equals(self._items[index], value):
+            NOTIFY_STATS.suppressed += 1
+            return
+        self._items[index] = value
+        self._emit(ListChange("set", index, value))
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice):
+            del self._items[index]
+            self._emit(self._reset_record())
+            return
+        index = range(len(self._items))[index]
+        self._emit(ListChange("remove", index, self._items.pop(index)))
+
+    def index(self, value: Any, start: int = 0, stop: int = sys.maxsize) -> int:
+        self._read()
+        return self._items.index(value, start, stop)
+
+    def insert(self, index: int, value: Any) -> None:
+        size = len(self._items)
+        index = max(0, size + index) if index < 0 else min(index, size)
+        self._items.insert(index, value)
+        self._emit(ListChange("insert", index, value))
+
+    def move(self, source: int, index: int) -> None:
+        """Move the item at ``source`` so that it ends up at ``index``."""
+        positions = range(len(self._items))
+        source, index = positions[source], positions[index]
+        if source == index:
+            return
+        value = self._items.pop(source)
+        self._items.insert(index, value)
+        self._emit(ListChange("move", index, value, source))
+
+    def clear(self) -> None:
+        if self._items:
+            self._items.clear()
+            self._emit(self._reset_record())
+
+    def sort(self, *, key: Any = None, reverse: bool = False) -> None:
+        self._items.sort(key=key, reverse=reverse)
+        self._emit(self._reset_record())
+
+    def reverse(self) -> None:
+        self._items.reverse()
+        self._emit(self._reset_record())
+
+    def _reset_record(self) -> ListChange:
+        return ListChange("reset", 0, list(self._items))
+
+
+class ObservableDict(_ObservableCollection, MutableMapping):
+    """A dict that reports which keys were set or deleted."""
+
+    def __init__(self, items: Any = (), equals: Equals = equal) -> None:
+        super().__init__(equals)
+        self._data: Dict[Any, Any] = dict(items)
+
+    def __repr__(self) -> str:
+        return f"ObservableDict({self._data!r})"
+
+    def __len__(self) -> int:
+        self._read()
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._read()
+        return iter(self._data)
+
+    def __getitem__(self, key: Any) -> Any:
+        self._read()
+        return self._data[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self._data and self._equals(self._data[key], value):
+            NOTIFY_STATS.suppressed += 1
+            return
+        self._data[key] = value
+        self._emit(DictChange("set", key, value))
+
+    def __delitem__(self, key: Any) -> None:
+        self._emit(DictChange("delete", key, self._data.pop(key)))
+
+    def clear(self) -> None:
+        if self._data:
+            self._data.clear()
+            self._emit(self._reset_record())
+
+    def _reset_record(self) -> DictChange:
+        return DictChange("reset", None, dict(self._data))
+
+
+def apply_list_changes(
+    target: List[Any],
+    changes: Iterable[ListChange],
+    transform: Callable[[Any], Any] = lambda value: value,
+) -> None:
+    """Replay ``changes`` on a plain list, mapping new items through ``transform``.
+
+    Keeps a derived list (rendered rows, DOM handles) aligned with an
+    ``ObservableList`` while only transforming the items that changed.
+    """
+    for change in changes:
+        kind = change.kind
+        if kind == "insert":
+            target.insert(change.position, transform(change.value))
+        elif kind == "remove":
+            del target[change.position]
+        elif kind == "set":
+            target[change.position] = transform(change.value)
+        elif kind == "move":
+            target.insert(change.position, target.pop(change.source))
+        elif kind == "reset":
+            target[:] = [transform(value) for value in change.value]
+
+
+# --- Profiling ---
+#
+# ``ReactiveProfiler`` measures subscriber deliveries: how often each signal,
+# observable field, collection and effect notified, for how many
+# subscribers, how long its callbacks took and how deep the cascade of
+# further notifications went. While it is stopped nothing is instrumented:
+# ``start()`` swaps profiled twins of the delivery paths into the classes
+# and ``stop()`` puts the originals back.
+
+
+class SourceStats:
+    """Deliveries of one signal, field (``Class.field``) or effect."""
+
+    __slots__ = ("notifications", "subscribers", "total", "max", "cascade")
+
+    def __init__(self) -> None:
+        self.notifications = 0
+        # Most subscribers seen at once.
+        self.subscribers = 0
+        # Seconds spent in callbacks: summed, and for the slowest delivery.
+        self.total = 0.0
+        self.max = 0.0
+        # Deepest chain of nested notifications started by one write here.
+        self.cascade = 0
+
+
+class CallbackStats:
+    """Calls and time of one subscriber callback."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+def _label(source: Any) -> str:
+    name = getattr(source, "name", "")
+    return name or f"{type(source).__name__}#{id(source):x}"
+
+
+def _callback_label(callback: Any) -> str:
+    if isinstance(callback, _WeakSubscriber):
+        callback = callback.ref() or callback
+    elif isinstance(callback, AsyncSubscriber):
+        callback = callback._fn
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+_profiler: Optional["ReactiveProfiler"] = None
+# The same profiler, for the twins below that only run while it is set.
+_recording: "ReactiveProfiler"
+
+
+class ReactiveProfiler:
+    """Per-source and per-callback timings of the reactive graph.
+
+    Use as ``with ReactiveProfiler() as prof:`` or call ``start()`` and
+    ``stop()``; then print ``prof.table()`` or save
+    ``prof.trace_events()`` as JSON and open it in Chrome's
+    ``chrome://tracing`` or Perfetto. Only one profiler runs at a time.
+    With ``trace=False`` no trace events are kept, only the aggregates.
+    """
+
+    def __init__(self, trace: bool = True, max_events: int = 100_000) -> None:
+        self.sources: Dict[str, SourceStats] = {}
+        self.callbacks: Dict[str, CallbackStats] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.trace = trace
+        self.max_events = max_events
+        self._depth = 0
+        self._deepest = 0
+        self._originals: Dict[str, Any] = {}
+        self._t0 = time.perf_counter()
+
+    @property
+    def active(self) -> bool:
+        return _profiler is self
+
+    def start(self) -> "ReactiveProfiler":
+        global _profiler, _recording, _notify_field
+        if _profiler is not None:
+            raise RuntimeError("Another ReactiveProfiler is already running")
+        _profiler = _recording = self
+        self._originals = {
+            "signal": Signal._run_subscribers,
+            "collection": _ObservableCollection._run_subscribers,
+            "field": _ObservedField.__set__,
+            "notify_field": _notify_field,
+            "effect": Effect._update,
+        }
+        Signal._run_subscribers = _profiled_signal_run  # type: ignore[method-assign]
+        _ObservableCollection._run_subscribers = _profiled_collection_run  # type: ignore[method-assign]
+        _ObservedField.__set__ = _profiled_field_set  # type: ignore[method-assign]
+        _notify_field = _profiled_notify_field
+        Effect._update = _profiled_effect_update  # type: ignore[method-assign]
+        return self
+
+    def stop(self) -> None:
+        global _profiler, _notify_field
+        if _profiler is not self:
+            return
+        originals = self._originals
+        Signal._run_subscribers = originals["signal"]  # type: ignore[method-assign]
+        _ObservableCollection._run_subscribers = originals["collection"]  # type: ignore[method-assign]
+        _ObservedField.__set__ = originals["field"]  # type: ignore[method-assign]
+        _notify_field = originals["notify_field"]
+        Effect._update = originals["effect"]  # type: ignore[method-assign]
+        _profiler = None
+
+    def __enter__(self) -> "ReactiveProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        self.sources.clear()
+        self.callbacks.clear()
+        self.events.clear()
+        self._t0 = time.perf_counter()
+
+    def _event(self, name: str, cat: str, start: float, end: float) -> None:
+        if self.trace and len(self.events) < self.max_events:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": (start - self._t0) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+
+    def _deliver(
+        self, label: str, cat: str, callbacks: Tuple[Any, ...], value: Any
+    ) -> None:
+        """Call ``callbacks`` with ``value``, timing each of them."""
+        stats = self.sources.get(label)
+        if stats is None:
+            stats = self.sources[label] = SourceStats()
+        stats.notifications += 1
+        if len(callbacks) > stats.subscribers:
+            stats.subscribers = len(callbacks)
+        self._depth += 1
+        if self._depth > self._deepest:
+            self._deepest = self._depth
+        clock = time.perf_counter
+        start = clock()
+        try:
+            for cb in callbacks:
+                before = clock()
+                try:
+                    cb(value)
+                finally:
+                    self._record_callback(cb, before, clock())
+        finally:
+            end = clock()
+            self._finish(stats, label, cat, start, end)
+
+    def _finish(
+        self, stats: SourceStats, label: str, cat: str, start: float, end: float
+    ) -> None:
+        elapsed = end - start
+        stats.total += elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        self._depth -= 1
+        if not self._depth:
+            # Back at the write that started it all.
+            if self._deepest > stats.cascade:
+                stats.cascade = self._deepest
+            self._deepest = 0
+        self._event(label, cat, start, end)
+
+    def _record_callback(self, callback: Any, start: float, end: float) -> None:
+        label = _callback_label(callback)
+        stats = self.callbacks.get(label)
+        if stats is None:
+            stats = self.callbacks[label] = CallbackStats()
+        elapsed = end - start
+        stats.calls += 1
+        stats.total += elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        self._event(label, "callback", start, end)
+
+    def _run_effect(self, eff: "Effect") -> None:
+        label = f"effect:{_callback_label(eff._fn)}"
+        stats = self.sources.get(label)
+        if stats is None:
+            stats = self.sources[label] = SourceStats()
+        stats.notifications += 1
+        self._depth += 1
+        if self._depth > self._deepest:
+            self._deepest = self._depth
+        start = time.perf_counter()
+        try:
+            self._originals["effect"](eff)
+        finally:
+            self._finish(stats, label, "effect", start, time.perf_counter())
+
+    def table(self, sort: str = "total", limit: int = 20) -> str:
+        """The ``limit`` hottest sources and callbacks as a text table.
+
+        ``sort`` is a ``SourceStats`` attribute: ``"total"``, ``"max"``,
+        ``"notifications"``, ``"subscribers"`` or ``"cascade"``.
+        """
+        rows = sorted(
+            self.sources.items(), key=lambda item: getattr(item[1], sort), reverse=True
+        )[:limit]
+        lines = [
+            f"{'source':<32}{'notifies':>10}{'subs':>6}"
+            f"{'total ms':>10}{'max ms':>9}{'depth':>7}"
+        ]
+        for label, st in rows:
+            lines.append(
+                f"{label[:31]:<32}{st.notifications:>10}{st.subscribers:>6}"
+                f"{st.total * 1e3:>10.3f}{st.max * 1e3:>9.3f}{st.cascade:>7}"
+            )
+        callbacks = sorted(
+            self.callbacks.items(), key=lambda item: item[1].total, reverse=True
+        )[:limit]
+        lines.append("")
+        lines.append(f"{'callback':<48}{'calls':>8}{'total ms':>10}{'max ms':>9}")
+        for label, cb in callbacks:
+            lines.append(
+                f"{label[:47]:<48}{cb.calls:>8}"
+                f"{cb.total * 1e3:>10.3f}{cb.max * 1e3:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def trace_events(self) -> Dict[str, Any]:
+        """The recorded deliveries in Chrome trace-event format."""
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def dump_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.trace_events(), f)
+
+
+# Profiled twins of the delivery paths, installed by ``ReactiveProfiler``.
+# They share everything up to the delivery itself with the originals (via
+# ``_store`` and ``_take_changes``) and only time the callback loop.
+
+
+def _profiled_signal_run(self: Signal) -> None:
+    _recording._deliver(_label(self), "signal", self._subscribers, self._value)
+
+
+def _profiled_collection_run(self: _ObservableCollection) -> None:
+    changes = self._take_changes()
+    if changes:
+        _recording._deliver(_label(self), "collection", self._subscribers, changes)
+
+
+def _field_label(obj: Any, name: str) -> str:
+    return f"{type(obj).__name__}.{name}"
+
+
+def _profiled_notify_field(obj: Any, name: str) -> None:
+    callbacks = obj._subscribers.get(name)
+    if callbacks:
+        _recording._deliver(
+            _field_label(obj, name), "field", callbacks, getattr(obj, name)
+        )
+
+
+def _profiled_field_set(self: _ObservedField, obj: Any, value: Any) -> None:
+    callbacks = self._store(obj, value)
+    if callbacks:
+        _recording._deliver(_field_label(obj, self.name), "field", callbacks, value)
+
+
+def _profiled_effect_update(self: Effect) -> None:
+    _recording._run_effect(self)
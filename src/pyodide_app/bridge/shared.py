@@ -0,0 +1,235 @@
+import asyncio
+import struct
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from .core import IS_EMSCRIPTEN
+from .reactivity import Equals, Signal, equal
+from .vdom import FrameClock, request_animation_frame
+
+if IS_EMSCRIPTEN:
+    import js
+else:
+    # Provide a mock for CPython unit testing
+    from unittest.mock import MagicMock
+
+    js = MagicMock()
+
+
+# --- Shared Signals ---
+#
+# A ``SharedSignal`` keeps its value in a SharedArrayBuffer that the main
+# thread and any number of workers map, so a worker publishes a result by
+# writing memory instead of posting a structured-clone message. The buffer
+# starts with an Int32 sequence counter guarding the value bytes (a
+# seqlock): a writer makes the counter odd, copies the packed value in and
+# makes it even again; a reader retries until it sees the same even counter
+# before and after copying. Readers find out about remote writes by
+# comparing the counter with the last one they saw, either once per frame
+# (``follow``) or by sleeping on it with ``Atomics.waitAsync`` (``watch``).
+
+_HEADER = 8  # Int32 sequence counter, padded to keep the value 8-aligned
+
+
+def _next_seq(seq: int) -> int:
+    """``seq + 2`` with the Int32 wrap-around that ``Atomics.store`` applies."""
+    return (seq + 2 + 2**31) % 2**32 - 2**31
+
+
+class JsSharedMemory:
+    """Sequence counter and value bytes in a JS ``SharedArrayBuffer``.
+
+    Pass ``buffer`` to map a buffer created elsewhere (e.g. received by a
+    worker); otherwise a new one is allocated. ``buffer`` is what to post to
+    other threads.
+    """
+
+    def __init__(self, size: int, buffer: Any = None) -> None:
+        if buffer is None:
+            buffer = js.SharedArrayBuffer.new(_HEADER + -(-size // 8) * 8)
+        self.buffer = buffer
+        self.size = size
+        self._header = js.Int32Array.new(buffer, 0, 1)
+        self._bytes = js.Uint8Array.new(buffer, _HEADER, size)
+
+    def seq(self) -> int:
+        return js.Atomics.load(self._header, 0)
+
+    def read(self) -> Tuple[int, bytes]:
+        header = self._header
+        while True:
+            before = js.Atomics.load(header, 0)
+            if before & 1:
+                continue  # a write is in progress
+            data = self._bytes.to_bytes()
+            if js.Atomics.load(header, 0) == before:
+                return before, data
+
+    def write(self, data: bytes) -> int:
+        header = self._header
+        while True:
+            # Claim the lock by moving an even counter to odd; several
+            # workers may write the same signal.
+            seq = js.Atomics.load(header, 0)
+            if (
+                not seq & 1
+                and js.Atomics.compareExchange(header, 0, seq, seq + 1) == seq
+            ):
+                break
+        self._bytes.assign(data)
+        seq = _next_seq(seq)
+        js.Atomics.store(header, 0, seq)
+        js.Atomics.notify(header, 0)
+        return seq
+
+    async def wait(self, seq: int) -> None:
+        """Return once the counter is no longer ``seq``."""
+        result = js.Atomics.waitAsync(self._header, 0, seq)
+        if getattr(result, "async"):
+            await result.value
+
+
+class LocalSharedMemory:
+    """In-process stand-in for ``JsSharedMemory``.
+
+    Used in CPython and on pages that are not cross-origin isolated, where
+    ``SharedArrayBuffer`` is unavailable; signals sharing one instance
+    behave like threads sharing a buffer.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.buffer = bytearray(size)
+        self._seq = 0
+        self._waiters: List[asyncio.Future[None]] = []
+
+    def seq(self) -> int:
+        return self._seq
+
+    def read(self) -> Tuple[int, bytes]:
+        return self._seq, bytes(self.buffer)
+
+    def write(self, data: bytes) -> int:
+        self.buffer[:] = data
+        self._seq = _next_seq(self._seq)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        return self._seq
+
+    async def wait(self, seq: int) -> None:
+        if self._seq != seq:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+
+SharedMemory = Union[JsSharedMemory, LocalSharedMemory]
+
+# ``Signal.value``; its setter does the equality check and notification.
+_signal_value: Any = Signal.__dict__["value"]
+
+
+class SharedSignal(Signal[Any]):
+    """A ``Signal`` whose value lives in shared memory.
+
+    ``fmt`` is a fixed-size ``struct`` format (little-endian unless stated
+    otherwise): ``"d"`` holds a float, ``"3f"`` a tuple of three floats.
+    Single-item formats read back as a scalar. Every thread creates its own
+    ``SharedSignal`` with the same ``fmt`` over the same ``buffer``; writing
+    ``value`` updates the shared bytes and notifies local subscribers, and
+    other threads see the write after their next ``poll()``.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "d",
+        value: Any = None,
+        buffer: Any = None,
+        memory: Optional[SharedMemory] = None,
+        equals: Equals = equal,
+        name: str = "",
+    ) -> None:
+        if fmt[:1] not in "@=<>!":
+            fmt = "<" + fmt
+        self._struct = struct.Struct(fmt)
+        if memory is None:
+            size = self._struct.size
+            if buffer is not None:
+                memory = JsSharedMemory(size, buffer)
+            elif IS_EMSCRIPTEN and js.crossOriginIsolated:
+                memory = JsSharedMemory(size)
+            else:
+                memory = LocalSharedMemory(size)
+        self.memory: SharedMemory = memory
+        self._seen, data = memory.read()
+        super().__init__(self._decode(data), equals, name)
+        self._following = False
+        if value is not None:
+            self.value = value
+
+    @property
+    def buffer(self) -> Any:
+        """The ``SharedArrayBuffer`` to hand to workers."""
+        return self.memory.buffer
+
+    def _decode(self, data: bytes) -> Any:
+        values = self._struct.unpack(data)
+        return values[0] if len(values) == 1 else values
+
+    def _encode(self, value: Any) -> bytes:
+        if isinstance(value, (tuple, list)):
+            return self._struct.pack(*value)
+        return self._struct.pack(value)
+
+    def _write(self, new_value: Any) -> None:
+        data = self._encode(new_value)
+        # Store what other threads will read back, e.g. 0.1 rounded to "f".
+        new_value = self._decode(data)
+        # Our value is stale if another thread wrote since the last poll(),
+        # so only skip the write when the memory still holds what we saw.
+        memory = self.memory
+        if memory.seq() != self._seen or not self._equals(self._value, new_value):
+            self._seen = memory.write(data)
+        _signal_value.__set__(self, new_value)
+
+    value = property(_signal_value.fget, _write)
+
+    def poll(self) -> bool:
+        """Pick up a write made by another thread; True if there was one."""
+        memory = self.memory
+        if memory.seq() == self._seen:
+            return False
+        self._seen, data = memory.read()
+        _signal_value.__set__(self, self._decode(data))
+        return True
+
+    def follow(self, clock: Optional[FrameClock] = None) -> Callable[[], None]:
+        """``poll()`` once per frame (or ``clock`` tick); returns a stopper.
+
+        Costs one ``Atomics.load`` per frame and works wherever
+        ``Atomics.waitAsync`` is missing.
+        """
+        tick_clock: FrameClock = clock or request_animation_frame
+        self._following = True
+
+        def tick(timestamp: Any = None) -> None:
+            if self._following:
+                self.poll()
+                tick_clock(tick)
+
+        tick_clock(tick)
+        return self._stop_following
+
+    def _stop_following(self) -> None:
+        self._following = False
+
+    async def watch(self) -> None:
+        """``poll()`` as soon as the counter moves, until cancelled.
+
+        Run it as a task: ``asyncio.ensure_future(signal.watch())``.
+        """
+        while True:
+            await self.memory.wait(self._seen)
+            self.poll()
@@ -1,10 +1,27 @@
-from typing import Any, Dict, Optional, Union
+import html
+from array import array
+from sys import intern
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from .core import IS_EMSCRIPTEN, keep_alive
+from .core import IS_EMSCRIPTEN, ProxyOwner
+from .reactivity import ListChange, ObservableList, apply_list_changes
 
 if IS_EMSCRIPTEN:
     import js
-    from pyodide.ffi import create_proxy
+    from pyodide.ffi import create_once_callable, create_proxy, to_js
 else:
     from unittest.mock import MagicMock
 
@@ -13,50 +30,1017 @@ else:
     def create_proxy(obj: Any) -> Any:
         return obj  # Return original object in CPython for logic testing
 
+    def to_js(obj: Any) -> Any:
+        return obj
+
+    def create_once_callable(obj: Any) -> Any:
+        return obj
+
+# --- DOM Mutation Op-Log ---
+#
+# Instead of calling into the DOM once per createElement/setAttribute/
+# appendChild, the engine appends integer-encoded operations to a flat buffer
+# and hands the whole batch to ``examples/js/vdom_applier.js`` in a single
+# call. Nodes are referred to by integer ids; id 0 is the container. String
+# operands (tags, attribute names and values, text) are indices into a
+# per-batch string table. The opcodes must stay in sync with the applier.
+
+OP_CREATE_ELEMENT = 1  # id, tag
+OP_CREATE_TEXT = 2  # id, text
+OP_SET_ATTR = 3  # id, name, value
+OP_REMOVE_ATTR = 4  # id, name
+OP_SET_TEXT = 5  # id, text
+OP_INSERT = 6  # parent, child, before (0 appends)
+OP_REMOVE = 7  # id (detaches the node and forgets its subtree)
+OP_REPLACE_CHILDREN = 8  # parent, child
+OP_DELEGATE = 9  # event type (installs one root listener for that type)
+OP_ADOPT = 10  # parent, id, tag: claim an existing server-rendered element
+OP_ADOPT_TEXT = 11  # parent, id, text: claim a server-rendered text node
+
+# Opcode -> (name, operand kinds): "i" is an integer, "s" a string index.
+OP_SPECS: Dict[int, Tuple[str, str]] = {
+    OP_CREATE_ELEMENT: ("create_element", "is"),
+    OP_CREATE_TEXT: ("create_text", "is"),
+    OP_SET_ATTR: ("set_attr", "iss"),
+    OP_REMOVE_ATTR: ("remove_attr", "is"),
+    OP_SET_TEXT: ("set_text", "is"),
+    OP_INSERT: ("insert", "iii"),
+    OP_REMOVE: ("remove", "i"),
+    OP_REPLACE_CHILDREN: ("replace_children", "ii"),
+    OP_DELEGATE: ("delegate", "s"),
+    OP_ADOPT: ("adopt", "iis"),
+    OP_ADOPT_TEXT: ("adopt_text", "iis"),
+}
+
+CONTAINER_ID = 0
+
+
+class OpLog:
+    """A flat int32 buffer of DOM operations plus its string table."""
+
+    __slots__ = ("ops", "strings", "_string_index")
+
+    def __init__(self) -> None:
+        self.ops = array("i")
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def string(self, value: str) -> int:
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self._string_index[value] = index
+        return index
+
+    def create_element(self, node_id: int, tag: str) -> None:
+        self.ops.extend((OP_CREATE_ELEMENT, node_id, self.string(tag)))
+
+    def create_text(self, node_id: int, text: str) -> None:
+        self.ops.extend((OP_CREATE_TEXT, node_id, self.string(text)))
+
+    def set_attr(self, node_id: int, name: str, value: str) -> None:
+        self.ops.extend((OP_SET_ATTR, node_id, self.string(name), self.string(value)))
+
+    def remove_attr(self, node_id: int, name: str) -> None:
+        self.ops.extend((OP_REMOVE_ATTR, node_id, self.string(name)))
+
+    def set_text(self, node_id: int, text: str) -> None:
+        self.ops.extend((OP_SET_TEXT, node_id, self.string(text)))
+
+    def insert(self, parent_id: int, child_id: int, before_id: int = 0) -> None:
+        self.ops.extend((OP_INSERT, parent_id, child_id, before_id))
+
+    def remove(self, node_id: int) -> None:
+        self.ops.extend((OP_REMOVE, node_id))
+
+    def replace_children(self, parent_id: int, child_id: int) -> None:
+        self.ops.extend((OP_REPLACE_CHILDREN, parent_id, child_id))
+
+    def delegate(self, event_type: str) -> None:
+        self.ops.extend((OP_DELEGATE, self.string(event_type)))
+
+    def adopt(self, parent_id: int, node_id: int, tag: str) -> None:
+        self.ops.extend((OP_ADOPT, parent_id, node_id, self.string(tag)))
+
+    def adopt_text(self, parent_id: int, node_id: int, text: str) -> None:
+        self.ops.extend((OP_ADOPT_TEXT, parent_id, node_id, self.string(text)))
+
+    def clear(self) -> None:
+        del self.ops[:]
+        self.strings = []
+        self._string_index = {}
+
+
+def decode_ops(ops: Sequence[int], strings: Sequence[str]) -> List[Tuple[Any, ...]]:
+    """Turn an encoded batch back into readable ``(name, *operands)`` tuples."""
+    decoded: List[Tuple[Any, ...]] = []
+    i = 0
+    while i < len(ops):
+        name, kinds = OP_SPECS[ops[i]]
+        operands = ops[i + 1 : i + 1 + len(kinds)]
+        decoded.append(
+            (name,)
+            + tuple(
+                strings[value] if kind == "s" else value
+                for kind, value in zip(kinds, operands)
+            )
+        )
+        i += 1 + len(kinds)
+    return decoded
+
+
+class OpCounter:
+    """CPython stand-in for the JS applier that tallies ops instead of running
+    them, so render cost can be measured without a browser."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {name: 0 for name, _ in OP_SPECS.values()}
+        self.batches = 0
+        self.strings = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def apply(self, ops: Sequence[int], strings: Sequence[str]) -> None:
+        self.batches += 1
+        self.strings += len(strings)
+        i = 0
+        while i < len(ops):
+            name, kinds = OP_SPECS[ops[i]]
+            self.counts[name] += 1
+            i += 1 + len(kinds)
+
+    def reset(self) -> None:
+        for name in self.counts:
+            self.counts[name] = 0
+        self.batches = 0
+        self.strings = 0
+
+
 # --- Virtual DOM Engine ---
 
+# Shared, read-only defaults so childless or prop-less nodes allocate nothing.
+EMPTY_PROPS: Mapping[str, Any] = MappingProxyType({})
+EMPTY_CHILDREN: Tuple[Any, ...] = ()
+
+_VNODE_FIELDS = frozenset(("tag", "props", "children", "key"))
+
+
+class VNode:
+    """A compact virtual element node.
 
-def h(
-    tag: str, props: Optional[Dict[str, Any]] = None, children: Any = None
-) -> Dict[str, Any]:
+    Supports ``vnode["tag"]``/``vnode["props"]``/``vnode["children"]`` so code
+    written against the original dict-based nodes keeps working.
+    """
+
+    __slots__ = ("tag", "props", "children", "key")
+
+    def __init__(
+        self,
+        tag: str,
+        props: Mapping[str, Any] = EMPTY_PROPS,
+        children: Sequence["VChild"] = EMPTY_CHILDREN,
+    ) -> None:
+        self.tag = tag
+        self.props = props
+        self.children = children
+        self.key = props.get("key") if props else None
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in _VNODE_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name) if name in _VNODE_FIELDS else default
+
+    def __repr__(self) -> str:
+        return f"VNode({self.tag!r}, {dict(self.props)!r}, {list(self.children)!r})"
+
+
+VChild = Union[VNode, str]
+
+_new_vnode = object.__new__
+
+
+def h(tag: str, props: Optional[Dict[str, Any]] = None, children: Any = None) -> VNode:
     """Hyperscript helper for Virtual Nodes."""
-    return {
-        "tag": tag,
-        "props": props or {},
-        "children": children
-        if isinstance(children, list)
-        else ([children] if children else []),
-    }
+    if isinstance(children, list):
+        kids: Sequence[VChild] = children or EMPTY_CHILDREN
+    else:
+        kids = (children,) if children else EMPTY_CHILDREN
+
+    # h() runs once per node per render, so fill the slots directly instead of
+    # paying for a VNode.__init__ call.
+    node = _new_vnode(VNode)
+    node.tag = intern(tag)
+    node.children = kids
+    if props:
+        node.props = props
+        node.key = props.get("key")
+    else:
+        node.props = EMPTY_PROPS
+        node.key = None
+    return node
+
+
+def _key_of(vnode: VChild) -> Any:
+    if isinstance(vnode, str):
+        return None
+    return vnode.key
+
+
+def _same_type(a: VChild, b: VChild) -> bool:
+    """Two vnodes can be patched in place if they share a tag and a key."""
+    if isinstance(a, str) or isinstance(b, str):
+        return isinstance(a, str) and isinstance(b, str)
+    return a.tag == b.tag and a.key == b.key
+
+
+def _longest_increasing_subsequence(seq: List[int]) -> List[int]:
+    """Indices of a longest strictly increasing run of non-negative values.
+
+    Entries of -1 mark freshly mounted children and are never part of the
+    result. Children whose index is in the result keep their DOM position;
+    everything else is moved.
+    """
+    tails: List[int] = []
+    prev = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        if value < 0:
+            continue
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seq[tails[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            prev[i] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+
+    result: List[int] = []
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        result.append(i)
+        i = prev[i]
+    result.reverse()
+    return result
+
+
+class _Mounted:
+    """Bookkeeping for a vnode that currently lives in the real DOM."""
+
+    __slots__ = ("vnode", "id", "children")
+
+    def __init__(self, vnode: VChild, node_id: int) -> None:
+        self.vnode = vnode
+        self.id = node_id
+        self.children: List[_Mounted] = []
 
 
 class PythonVDOM:
-    """A minimal Pure Python Virtual DOM engine."""
+    """A minimal Pure Python Virtual DOM engine.
+
+    The previously rendered tree is kept between calls to ``patch`` and
+    diffed against the new one, so only changed attributes, text and child
+    positions touch the real DOM. Children carrying a ``key`` prop are matched
+    by key, which lets reordered lists move existing nodes instead of
+    recreating them.
+
+    Mutations are recorded in an ``OpLog`` and applied in one call per patch.
+    In the browser the applier is ``VDOMApplier`` from
+    ``examples/js/vdom_applier.js``; under CPython it defaults to an
+    ``OpCounter``.
 
-    def __init__(self, container_id: str) -> None:
+    Events are delegated: the container gets a single listener per event
+    type, and ``on*`` props only update a Python-side table keyed by node id.
+    Re-rendering a handler therefore never creates a proxy, and entries are
+    dropped as soon as their node is removed.
+    """
+
+    def __init__(
+        self,
+        container_id: str,
+        applier: Any = None,
+        scheduler: Optional["RenderScheduler"] = None,
+    ) -> None:
         self.container = js.document.getElementById(container_id)
+        self.scheduler = scheduler if scheduler is not None else default_scheduler
+        self.component: Optional[Component] = None
+        self._root: Optional[_Mounted] = None
+        self._log = OpLog()
+        self._next_id = CONTAINER_ID + 1
+        # node id -> {event type: handler}
+        self._handlers: Dict[int, Dict[str, Callable[[Any], Any]]] = {}
+        self._delegated: Set[str] = set()
+        self.skipped_subtrees = 0
+        # Proxies handed to JS by this engine; freed by ``unmount``.
+        self.proxies = ProxyOwner(f"PythonVDOM#{container_id}")
+
+        if applier is None:
+            if IS_EMSCRIPTEN:
+                dispatch = self.proxies.adopt(create_proxy(self._dispatch))
+                applier = js.VDOMApplier.new(self.container, dispatch)
+            else:
+                applier = OpCounter()
+        self.applier = applier
+
+    # --- Events ---
+
+    def _dispatch(self, event_type: str, path: Iterable[int], event: Any) -> None:
+        """Run handlers for ``event_type`` along ``path``, innermost first.
+
+        ``path`` holds the ids of the VDOM nodes between the event target and
+        the container, as collected by the applier's root listener.
+        """
+        handlers = self._handlers
+        for node_id in path:
+            by_type = handlers.get(node_id)
+            if by_type is None:
+                continue
+            handler = by_type.get(event_type)
+            if handler is not None:
+                handler(event)
+                if getattr(event, "cancelBubble", False) is True:
+                    break
+
+    @property
+    def handler_count(self) -> int:
+        """Number of live event handlers, for leak checks."""
+        return sum(len(by_type) for by_type in self._handlers.values())
+
+    # --- Mounting ---
+
+    def _mount(self, vnode: VChild) -> _Mounted:
+        node_id = self._next_id
+        self._next_id += 1
 
-    def _create_element(self, vnode: Union[Dict[str, Any], str]) -> Any:
         if isinstance(vnode, str):
-            return js.document.createTextNode(vnode)
+            self._log.create_text(node_id, vnode)
+            return _Mounted(vnode, node_id)
+
+        mounted = _Mounted(vnode, node_id)
+        self._log.create_element(node_id, vnode.tag)
+        for name, value in vnode.props.items():
+            self._set_prop(mounted, name, value)
+
+        for child in vnode.children:
+            child_mounted = self._mount(child)
+            self._log.insert(node_id, child_mounted.id)
+            mounted.children.append(child_mounted)
+        return mounted
 
-        el = js.document.createElement(vnode["tag"])
+    def _adopt(self, parent_id: int, vnode: VChild) -> _Mounted:
+        """Like ``_mount``, but claims the next existing DOM child instead."""
+        node_id = self._next_id
+        self._next_id += 1
 
-        for name, value in vnode["props"].items():
+        if isinstance(vnode, str):
+            # The applier checks the server text against ``vnode``.
+            self._log.adopt_text(parent_id, node_id, vnode)
+            return _Mounted(vnode, node_id)
+
+        mounted = _Mounted(vnode, node_id)
+        self._log.adopt(parent_id, node_id, vnode.tag)
+        # Attributes are already in the markup; only handlers need wiring.
+        for name, value in vnode.props.items():
             if name.startswith("on"):
-                # Automatically wrap event handlers in proxies if they aren't already
-                # and keep them alive.
-                callback = value
-                if not hasattr(value, "destroy"):
-                    callback = keep_alive(create_proxy(value))
-                el.addEventListener(name[2:], callback)
+                self._set_prop(mounted, name, value)
+
+        for child in vnode.children:
+            mounted.children.append(self._adopt(node_id, child))
+        return mounted
+
+    def _unmount(self, mounted: _Mounted) -> None:
+        """Emit the removal of ``mounted`` and drop its handlers."""
+        self._log.remove(mounted.id)
+        self._release(mounted)
+
+    def _release(self, mounted: _Mounted) -> None:
+        self._handlers.pop(mounted.id, None)
+        for child in mounted.children:
+            self._release(child)
+
+    # --- Props ---
+
+    def _set_prop(self, mounted: _Mounted, name: str, value: Any) -> None:
+        if name == "key":
+            return
+        if name.startswith("on"):
+            event_type = name[2:]
+            if event_type not in self._delegated:
+                self._delegated.add(event_type)
+                self._log.delegate(event_type)
+            # Handlers live in a Python-side table, so swapping one for
+            # another never needs a new proxy or another DOM listener.
+            self._handlers.setdefault(mounted.id, {})[event_type] = value
+        else:
+            self._log.set_attr(mounted.id, name, str(value))
+
+    def _remove_prop(self, mounted: _Mounted, name: str) -> None:
+        if name == "key":
+            return
+        if name.startswith("on"):
+            by_type = self._handlers.get(mounted.id)
+            if by_type is not None:
+                by_type.pop(name[2:], None)
+                if not by_type:
+                    del self._handlers[mounted.id]
+        else:
+            self._log.remove_attr(mounted.id, name)
+
+    def _patch_props(
+        self,
+        mounted: _Mounted,
+        old_props: Mapping[str, Any],
+        new_props: Mapping[str, Any],
+    ) -> None:
+        for name, value in new_props.items():
+            if name not in old_props:
+                self._set_prop(mounted, name, value)
+                continue
+            old_value = old_props[name]
+            if name.startswith("on"):
+                if old_value is not value:
+                    self._set_prop(mounted, name, value)
+            elif str(old_value) != str(value):
+                self._set_prop(mounted, name, value)
+
+        for name in old_props:
+            if name not in new_props:
+                self._remove_prop(mounted, name)
+
+    # --- Diffing ---
+
+    def _patch_node(self, parent_id: int, old: _Mounted, vnode: VChild) -> _Mounted:
+        """Bring ``old`` in line with ``vnode`` and return the live record."""
+        if old.vnode is vnode:
+            # Memoized subtree: nothing below here can have changed.
+            self.skipped_subtrees += 1
+            return old
+
+        if not _same_type(old.vnode, vnode):
+            new = self._mount(vnode)
+            self._log.insert(parent_id, new.id, old.id)
+            self._unmount(old)
+            return new
+
+        if isinstance(vnode, str):
+            if old.vnode != vnode:
+                self._log.set_text(old.id, vnode)
+            old.vnode = vnode
+            return old
+
+        old_vnode = old.vnode
+        assert not isinstance(old_vnode, str)  # noqa: S101
+        self._patch_props(old, old_vnode.props, vnode.props)
+        self._patch_children(old, vnode.children)
+        old.vnode = vnode
+        return old
+
+    def _patch_children(self, parent: _Mounted, new_children: Sequence[VChild]) -> None:
+        old = parent.children
+        parent_id = parent.id
+        result: List[Optional[_Mounted]] = [None] * len(new_children)
+
+        # 1. Common prefix.
+        start = 0
+        old_end = len(old) - 1
+        new_end = len(new_children) - 1
+        while (
+            start <= old_end
+            and start <= new_end
+            and _same_type(old[start].vnode, new_children[start])
+        ):
+            result[start] = self._patch_node(parent_id, old[start], new_children[start])
+            start += 1
+
+        # 2. Common suffix.
+        while (
+            start <= old_end
+            and start <= new_end
+            and _same_type(old[old_end].vnode, new_children[new_end])
+        ):
+            result[new_end] = self._patch_node(
+                parent_id, old[old_end], new_children[new_end]
+            )
+            old_end -= 1
+            new_end -= 1
+
+        # 3. Match the unsettled middle by key, falling back to position order
+        # among unkeyed children of the same type.
+        by_key: Dict[Any, int] = {}
+        unkeyed: List[int] = []
+        for i in range(start, new_end + 1):
+            key = _key_of(new_children[i])
+            if key is None:
+                unkeyed.append(i)
+            else:
+                by_key[key] = i
+
+        sources = [-1] * (new_end - start + 1)
+        for old_index in range(start, old_end + 1):
+            old_child = old[old_index]
+            key = _key_of(old_child.vnode)
+            match: Optional[int] = None
+            if key is not None:
+                candidate = by_key.pop(key, None)
+                if candidate is not None and _same_type(
+                    old_child.vnode, new_children[candidate]
+                ):
+                    match = candidate
             else:
-                el.setAttribute(name, str(value))
+                for pos, candidate in enumerate(unkeyed):
+                    if _same_type(old_child.vnode, new_children[candidate]):
+                        match = candidate
+                        del unkeyed[pos]
+                        break
+
+            if match is None:
+                self._unmount(old_child)
+            else:
+                sources[match - start] = old_index
+                result[match] = self._patch_node(
+                    parent_id, old_child, new_children[match]
+                )
+
+        # 4. Walk the middle backwards, inserting new nodes and moving the
+        # ones that are not part of the longest already-ordered run.
+        stable = set(_longest_increasing_subsequence(sources))
+        after = result[new_end + 1] if new_end + 1 < len(result) else None
+        anchor = after.id if after is not None else 0
+        for offset in range(len(sources) - 1, -1, -1):
+            index = start + offset
+            mounted = result[index]
+            if mounted is None:
+                mounted = self._mount(new_children[index])
+                result[index] = mounted
+                self._log.insert(parent_id, mounted.id, anchor)
+            elif offset not in stable:
+                self._log.insert(parent_id, mounted.id, anchor)
+            anchor = mounted.id
+
+        parent.children = [m for m in result if m is not None]
+
+    def _flush(self) -> None:
+        """Ship the pending op-log to the applier in a single call."""
+        log = self._log
+        if not len(log):
+            return
+        self.applier.apply(to_js(log.ops), to_js(log.strings))
+        log.clear()
+
+    def patch(self, new_vtree: VChild) -> None:
+        """Reconcile the container's DOM with ``new_vtree``.
+
+        The first call mounts the tree; subsequent calls diff against the
+        previous tree and only apply the minimal set of DOM mutations.
+        """
+        if self._root is None:
+            self._root = self._mount(new_vtree)
+            self._log.replace_children(CONTAINER_ID, self._root.id)
+        else:
+            self._root = self._patch_node(CONTAINER_ID, self._root, new_vtree)
+        self._flush()
+
+    def hydrate(self, vtree: VChild) -> None:
+        """Take over DOM that was pre-rendered with ``render_to_string``.
+
+        Existing nodes are adopted in document order and only event handlers
+        are attached, so nothing is recreated. If the markup does not match
+        ``vtree`` (a different tag or different text) the container is
+        rendered from scratch instead.
+        """
+        self._root = self._adopt(CONTAINER_ID, vtree)
+        try:
+            self._flush()
+        except Exception as e:
+            print(f"Warning: hydration failed ({e}); rendering from scratch.")
+            self._log.clear()
+            self._handlers.clear()
+            self._delegated.clear()
+            self._root = None
+            self.patch(vtree)
+
+    def mount(self, component: "Component", hydrate: bool = False) -> None:
+        """Render ``component`` into the container and keep it in sync.
+
+        Later ``set_state`` calls on the component (or any component it
+        renders) are coalesced by the scheduler into one patch per frame.
+        With ``hydrate=True`` the server-rendered markup already in the
+        container is adopted instead of replaced.
+        """
+        component.engine = self
+        self.component = component
+        if hydrate:
+            self.hydrate(component.view())
+        else:
+            self.patch(component.view())
+
+    def unmount(self) -> None:
+        """Remove the rendered tree and free every proxy the engine created.
+
+        The engine cannot be used afterwards.
+        """
+        if self._root is not None:
+            self._unmount(self._root)
+            self._root = None
+            self._flush()
+        if self.component is not None:
+            self.component.engine = None
+            self.component = None
+        self.scheduler.cancel(self)
+        destroy = getattr(self.applier, "destroy", None)
+        if destroy is not None:
+            destroy()
+        self.proxies.destroy()
+
+    def render(self) -> None:
+        """Re-render the mounted component now."""
+        if self.component is not None:
+            self.patch(self.component.view())
+
+    def flush_sync(self) -> None:
+        """Apply pending scheduled renders immediately instead of next frame."""
+        self.scheduler.flush_sync()
+
+
+# --- Memoized Components ---
+
+
+class MemoStats:
+    """Hit/miss counters for component render caches."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+
+# Aggregate over every component instance.
+MEMO_STATS = MemoStats()
+
+
+def _shallow_equal(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    if a is b:
+        return True
+    if a.keys() != b.keys():
+        return False
+    for name, value in a.items():
+        other = b[name]
+        if value is not other and value != other:
+            return False
+    return True
+
+
+class Component:
+    """A VDOM component whose rendered vnode is memoized on props and state.
+
+    Subclasses implement ``render`` using ``self.props`` and ``self.state``.
+    ``view`` only calls ``render`` when the props are not shallowly equal to
+    the previous ones or the state object was replaced (``set_state`` always
+    replaces it). Otherwise it returns the previous vnode unchanged, and the
+    reconciler skips that whole subtree because it is the very same object it
+    rendered last time.
+    """
+
+    def __init__(self, props: Optional[Dict[str, Any]] = None) -> None:
+        self.props: Dict[str, Any] = props or {}
+        self.state: Dict[str, Any] = {}
+        self.memo = MemoStats()
+        # Set on root components by PythonVDOM.mount.
+        self.engine: Optional[PythonVDOM] = None
+        self._parent: Optional[Component] = None
+        self._vnode: Optional[VChild] = None
+        self._rendered_props: Dict[str, Any] = {}
+        self._rendered_state: Optional[Dict[str, Any]] = None
+
+    def set_state(self, **changes: Any) -> None:
+        """Replace the state and schedule a re-render of the owning tree."""
+        self.state = {**self.state, **changes}
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the cached vnodes from here up to the root component.
+
+        Ancestors must re-render too, otherwise they would keep handing out
+        a tree that embeds this component's stale vnode.
+        """
+        node: Optional[Component] = self
+        root = self
+        while node is not None:
+            node._vnode = None
+            root = node
+            node = node._parent
+        if root.engine is not None:
+            root.engine.scheduler.mark_dirty(root.engine)
+
+    def render(self) -> VChild:
+        raise NotImplementedError
+
+    def view(self, props: Optional[Dict[str, Any]] = None) -> VChild:
+        """Return this component's vnode, re-rendering only if needed."""
+        if props is not None:
+            self.props = props
+        self._parent = _rendering[-1] if _rendering else None
+
+        if (
+            self._vnode is not None
+            and self._rendered_state is self.state
+            and _shallow_equal(self._rendered_props, self.props)
+        ):
+            self.memo.hits += 1
+            MEMO_STATS.hits += 1
+            return self._vnode
+
+        self.memo.misses += 1
+        MEMO_STATS.misses += 1
+        self._rendered_props = dict(self.props)
+        self._rendered_state = self.state
+        _rendering.append(self)
+        try:
+            self._vnode = self.render()
+        finally:
+            _rendering.pop()
+        return self._vnode
+
+
+# Components whose render() is currently running, innermost last.
+_rendering: List[Component] = []
+
+
+# --- Virtualized Lists ---
+
+
+class VirtualList(Component):
+    """Renders only the rows of a long collection that are in view.
+
+    Props:
+        items: the full sequence; only ``len()`` and indexing are used.
+        render_row: ``(item, index) -> vnode`` for a single row.
+        row_height: fixed row height in pixels.
+        height: viewport height in pixels.
+        overscan: extra rows rendered above and below the viewport.
+
+    Rows are absolutely positioned inside a spacer as tall as the whole list,
+    so the number of vnodes and DOM nodes depends on the viewport, not on
+    ``len(items)``. Each row is keyed by its slot in the window
+    (``index % window``): when scrolling, the row that leaves the viewport
+    is patched into the one that enters it, reusing its DOM node in place.
+    """
+
+    def __init__(self, props: Dict[str, Any]) -> None:
+        super().__init__(props)
+        self.state = {"scroll_top": 0}
+
+    @property
+    def window(self) -> int:
+        """Number of row slots rendered at once."""
+        visible = -(-int(self.props["height"]) // int(self.props["row_height"]))
+        return visible + 2 * int(self.props.get("overscan", 5)) + 1
+
+    def visible_range(self) -> Tuple[int, int]:
+        """``(first, stop)`` indices of the rows currently rendered."""
+        row_height = int(self.props["row_height"])
+        overscan = int(self.props.get("overscan", 5))
+        count = len(self.props["items"])
+        first = int(self.state["scroll_top"]) // row_height - overscan
+        # Keep the window full at the end of the list so no slot is dropped.
+        first = max(0, min(first, count - self.window))
+        return first, min(count, first + self.window)
+
+    def on_scroll(self, event: Any) -> None:
+        scroll_top = int(event.target.scrollTop)
+        row_height = int(self.props["row_height"])
+        # Only re-render when the first visible row actually changes.
+        if scroll_top // row_height != int(self.state["scroll_top"]) // row_height:
+            self.set_state(scroll_top=scroll_top)
+
+    def render(self) -> VChild:
+        items = self.props["items"]
+        render_row = self.props["render_row"]
+        row_height = int(self.props["row_height"])
+        window = self.window
+        first, stop = self.visible_range()
+
+        # Order rows by slot rather than by index so the DOM order stays put
+        # and scrolling never has to move nodes.
+        slots: List[Optional[VChild]] = [None] * window
+        for index in range(first, stop):
+            slot = index % window
+            slots[slot] = h(
+                "div",
+                {
+                    "key": slot,
+                    "class": "vlist-row",
+                    "style": (
+                        f"position:absolute;left:0;right:0;"
+                        f"top:{index * row_height}px;height:{row_height}px"
+                    ),
+                },
+                render_row(items[index], index),
+            )
+
+        return h(
+            "div",
+            {
+                "class": "vlist",
+                "style": (
+                    f"height:{self.props['height']}px;overflow-y:auto;position:relative"
+                ),
+                "onscroll": self.on_scroll,
+            },
+            h(
+                "div",
+                {
+                    "class": "vlist-spacer",
+                    "style": f"position:relative;height:{len(items) * row_height}px",
+                },
+                [row for row in slots if row is not None],
+            ),
+        )
+
+
+# --- Reactive Lists ---
+
+
+class ListView(Component):
+    """Keyed list bound to an ``ObservableList``.
+
+    Props:
+        items: the ``ObservableList`` to display.
+        render_item: ``item -> vnode``; the vnode must carry a unique ``key``.
+        tag: container tag, ``"ul"`` by default.
+        attrs: props of the container element.
+
+    Row vnodes are cached and the list's change records are replayed on the
+    cache, so ``render_item`` only runs for inserted or replaced items. All
+    other rows are handed back unchanged and skipped by the reconciler,
+    which then emits DOM operations for the affected rows only.
+    """
+
+    def __init__(self, props: Dict[str, Any]) -> None:
+        super().__init__(props)
+        self.rows: List[VChild] = []
+        self.renders = 0  # render_item calls, for tests and profiling
+        self._items: Optional[ObservableList] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    def _render_item(self, item: Any) -> VChild:
+        self.renders += 1
+        return self.props["render_item"](item)
+
+    def _on_changes(self, changes: List[ListChange]) -> None:
+        apply_list_changes(self.rows, changes, self._render_item)
+        if self._vnode is not None:
+            self.invalidate()
+
+    def render(self) -> VChild:
+        items = self.props["items"]
+        if items is not self._items:
+            if self._unsubscribe is not None:
+                self._unsubscribe()
+            self._items = items
+            # The initial "reset" record fills ``rows`` (we are rendering
+            # already, so it must not invalidate). The subscription is weak
+            # so the list does not keep a discarded view alive.
+            self._vnode = None
+            self._unsubscribe = items.subscribe(self._on_changes, weak=True)
+        return h(self.props.get("tag", "ul"), self.props.get("attrs"), list(self.rows))
+
+
+# --- Render Scheduling ---
+
+FrameClock = Callable[[Callable[[Any], None]], Any]
+
+
+def request_animation_frame(callback: Callable[[Any], None]) -> Any:
+    """Default scheduler clock: run ``callback`` once on the next browser frame."""
+    return js.requestAnimationFrame(create_once_callable(callback))
+
+
+class RenderScheduler:
+    """Coalesces re-renders into a single flush per animation frame.
+
+    Engines are marked dirty instead of patched immediately; the first mark
+    requests a frame from ``clock`` and every further mark before it fires
+    is free. ``flush_sync`` renders everything pending right away.
+    """
+
+    def __init__(self, clock: Optional[FrameClock] = None) -> None:
+        self.clock: FrameClock = clock or request_animation_frame
+        self.flushes = 0
+        self._dirty: Dict[int, PythonVDOM] = {}
+        self._frame_pending = False
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._dirty)
+
+    def mark_dirty(self, engine: PythonVDOM) -> None:
+        self._dirty[id(engine)] = engine
+        if not self._frame_pending:
+            self._frame_pending = True
+            self.clock(self._on_frame)
+
+    def cancel(self, engine: PythonVDOM) -> None:
+        self._dirty.pop(id(engine), None)
+
+    def _on_frame(self, timestamp: Any = None) -> None:
+        self._frame_pending = False
+        self.flush_sync()
+
+    def flush_sync(self) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        self.flushes += 1
+        for engine in dirty.values():
+            engine.render()
+
+
+default_scheduler = RenderScheduler()
+
+
+# --- Server-Side Rendering ---
+
+# Elements that never have children or a closing tag.
+VOID_ELEMENTS = frozenset(
+    (
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    )
+)
+
+# Keeps adjacent text children as separate DOM text nodes after parsing, so
+# hydration can pair them with their vnodes.
+_TEXT_SEPARATOR = "<!-- -->"
+
+
+def render_to_string(vnode: VChild) -> str:
+    """Render a vtree to HTML in plain CPython (no ``js`` needed).
+
+    Event handlers and ``key`` props are omitted; ``PythonVDOM.hydrate``
+    attaches handlers to the resulting markup once Pyodide has booted.
+    """
+    parts: List[str] = []
+    _render_into(vnode, parts)
+    return "".join(parts)
+
+
+def _render_into(vnode: VChild, parts: List[str]) -> None:
+    if isinstance(vnode, str):
+        parts.append(html.escape(vnode, quote=False))
+        return
 
-        for child in vnode["children"]:
-            el.appendChild(self._create_element(child))
-        return el
+    parts.append("<" + vnode.tag)
+    for name, value in vnode.props.items():
+        if name == "key" or name.startswith("on"):
+            continue
+        parts.append(f' {name}="{html.escape(str(value))}"')
+    parts.append(">")
+    if vnode.tag in VOID_ELEMENTS:
+        return
 
-    def patch(self, new_vtree: Dict[str, Any]) -> None:
-        """Re-render the tree into the container."""
-        new_dom = self._create_element(new_vtree)
-        self.container.replaceChildren(new_dom)
+    previous_was_text = False
+    for child in vnode.children:
+        is_text = isinstance(child, str)
+        if is_text and previous_was_text:
+            parts.append(_TEXT_SEPARATOR)
+        _render_into(child, parts)
+        previous_was_text = is_text
+    parts.append(f"</{vnode.tag}>")
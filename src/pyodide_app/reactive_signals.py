@@ -1,7 +1,7 @@
 from typing import Any
 
-from pyodide_app.bridge.core import IS_EMSCRIPTEN, keep_alive
-from pyodide_app.bridge.reactivity import Signal
+from pyodide_app.bridge.core import IS_EMSCRIPTEN, ProxyOwner
+from pyodide_app.bridge.reactivity import Computed, Signal, effect
 
 if IS_EMSCRIPTEN:
     import js
@@ -19,6 +19,12 @@ else:
 count: Signal[int] = Signal(0)
 theme: Signal[str] = Signal("light")
 
+# Derived state: cached, and only recomputed after `count` changes
+double: Computed[int] = Computed(lambda: count.value * 2)
+
+# Owns the button listeners so teardown() can release them together
+ui_proxies = ProxyOwner("reactive_signals")
+
 
 def setup_signals() -> None:
     # Subscriber 1: Update text
@@ -26,10 +32,10 @@ def setup_signals() -> None:
         lambda v: setattr(js.document.getElementById("sig-count"), "innerText", str(v))
     )
 
-    # Subscriber 2: Update calculation
-    count.subscribe(
-        lambda v: setattr(
-            js.document.getElementById("sig-double"), "innerText", str(v * 2)
+    # Effect: Update calculation (tracks `double`, and through it `count`)
+    effect(
+        lambda: setattr(
+            js.document.getElementById("sig-double"), "innerText", str(double.value)
         )
     )
 
@@ -54,12 +60,20 @@ def toggle_theme(event: Any) -> None:
 def setup_ui() -> None:
     inc_btn = js.document.getElementById("sig-inc")
     if inc_btn:
-        # Use bridge helper to keep event listeners alive
-        inc_btn.onclick = keep_alive(create_proxy(increment))
+        # The owner keeps event listeners alive until teardown()
+        inc_btn.onclick = ui_proxies.adopt(create_proxy(increment))
 
     theme_btn = js.document.getElementById("sig-theme")
     if theme_btn:
-        theme_btn.onclick = keep_alive(create_proxy(toggle_theme))
+        theme_btn.onclick = ui_proxies.adopt(create_proxy(toggle_theme))
+
+
+def teardown() -> None:
+    for element_id in ("sig-inc", "sig-theme"):
+        btn = js.document.getElementById(element_id)
+        if btn:
+            btn.onclick = None
+    ui_proxies.destroy()
 
 
 setup_signals()
@@ -1,40 +1,61 @@
 from typing import Any
 
-from pyodide_app.bridge.vdom import PythonVDOM, h
+from pyodide_app.bridge.vdom import Component, PythonVDOM, VNode, h
 
 
-class CounterApp:
-    def __init__(self, engine: PythonVDOM) -> None:
-        self.engine = engine
-        self.count = 0
+class Heading(Component):
+    def render(self) -> VNode:
+        return h("h2", {}, self.props["title"])
 
+
+class Button(Component):
+    def render(self) -> VNode:
+        return h("button", {"onclick": self.props["onclick"]}, self.props["label"])
+
+
+class CounterApp(Component):
+    def __init__(self) -> None:
+        super().__init__()
+        self.state = {"count": 0}
+
+        # Static parts are memoized components: after the first render they
+        # hand back the same vnode, so the engine skips them entirely.
+        self.heading = Heading({"title": "Pure Python VDOM"})
+        self.increment_button = Button(
+            {"label": "Increment", "onclick": self.increment}
+        )
+        self.reset_button = Button({"label": "Reset", "onclick": self.reset})
+
+    @property
+    def count(self) -> int:
+        return int(self.state["count"])
+
+    # set_state only marks the app dirty; the engine's scheduler patches the
+    # DOM once on the next animation frame, however many updates happened.
     def increment(self, event: Any) -> None:
-        self.count += 1
-        self.update()
+        self.set_state(count=self.count + 1)
 
     def reset(self, event: Any) -> None:
-        self.count = 0
-        self.update()
+        self.set_state(count=0)
 
-    def render(self) -> Any:
-        # Event handlers are automatically wrapped in proxies by PythonVDOM engine
+    def render(self) -> VNode:
+        # Event handlers are dispatched from a Python-side table by PythonVDOM
         return h(
             "div",
             {"class": "card"},
             [
-                h("h2", {}, "Pure Python VDOM"),
+                self.heading.view(),
                 h("p", {}, f"Count: {self.count}"),
-                h("button", {"onclick": self.increment}, "Increment"),
-                h("button", {"onclick": self.reset}, "Reset"),
+                self.increment_button.view(),
+                self.reset_button.view(),
             ],
         )
 
-    def update(self) -> None:
-        self.engine.patch(self.render())
-
 
 # Initialization
 engine = PythonVDOM("vdom-root")
-app = CounterApp(engine)
-app.update()
+app = CounterApp()
+# Pages that ship markup pre-rendered with render_to_string(app.view()) mark
+# the container with data-ssr, so the existing nodes are adopted, not rebuilt.
+engine.mount(app, hydrate=engine.container.hasAttribute("data-ssr") is True)
 print("Unified VDOM Pattern Ready")
@@ -0,0 +1,146 @@
+"""
+Interactive Python engine for the virtual terminal.
+
+Kept free of ``js`` and ``pyodide_app`` imports so the very same file can be
+written into a worker's filesystem and run there (see ``WorkerRepl``).
+"""
+
+import ast
+import code
+import codeop
+import inspect
+from collections import OrderedDict
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple
+
+# Statements may ``await`` at the top level, as in ``python -m asyncio``.
+ALLOW_TOP_LEVEL_AWAIT = ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+
+class CachingCompiler(codeop.CommandCompiler):
+    """``CommandCompiler`` that allows top-level ``await`` and caches code.
+
+    Code objects are kept by source (and the ``__future__`` flags in
+    effect), so running the same command again skips compilation. An
+    incomplete source is cached too, which makes re-checking a growing
+    multi-line block cheap. At most ``max_entries`` sources are kept.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        super().__init__()
+        self.compiler.flags |= ALLOW_TOP_LEVEL_AWAIT
+        self.max_entries = max_entries
+        self.cache: OrderedDict[Tuple[str, str, str, int], Optional[CodeType]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(
+        self, source: str, filename: str = "<input>", symbol: str = "single"
+    ) -> Optional[CodeType]:
+        key = (source, filename, symbol, self.compiler.flags)
+        cache = self.cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+        # Syntax errors propagate and are not cached.
+        compiled = super().__call__(source, filename, symbol)
+        self.misses += 1
+        cache[key] = compiled
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return compiled
+
+
+class ReplEngine(code.InteractiveInterpreter):
+    """A line-oriented REPL with multi-line blocks and top-level ``await``.
+
+    ``push`` takes one line at a time, like ``code.InteractiveConsole``,
+    and returns True while a block still needs more lines. Expression
+    results are printed by ``sys.displayhook`` and errors as tracebacks on
+    ``sys.stderr``, so the output lands wherever those streams point.
+    """
+
+    def __init__(
+        self,
+        namespace: Optional[Dict[str, Any]] = None,
+        filename: str = "<console>",
+        max_cached: int = 256,
+    ) -> None:
+        super().__init__(
+            namespace
+            if namespace is not None
+            else {"__name__": "__console__", "__doc__": None}
+        )
+        self.compile = CachingCompiler(max_cached)
+        self.filename = filename
+        self.buffer: List[str] = []
+
+    @property
+    def prompt(self) -> str:
+        return "..." if self.buffer else ">>>"
+
+    async def push(self, line: str) -> bool:
+        """Add ``line``; run the buffer once it forms a complete statement."""
+        self.buffer.append(line)
+        source = "\n".join(self.buffer)
+        try:
+            compiled = self.compile(source, self.filename, "single")
+        except (OverflowError, SyntaxError, ValueError):
+            self.buffer = []
+            self.showsyntaxerror(self.filename)
+            return False
+        if compiled is None:
+            return True
+        self.buffer = []
+        await self.run(compiled)
+        return False
+
+    async def run(self, compiled: CodeType) -> None:
+        """Execute ``compiled``, awaiting it if it used top-level ``await``."""
+        try:
+            result = eval(compiled, self.locals)  # noqa: S307
+            if compiled.co_flags & inspect.CO_COROUTINE:
+                await result
+        except SystemExit:
+            raise
+        except Exception:
+            self.showtraceback()
+
+    def reset(self) -> None:
+        """Drop a half-entered block."""
+        self.buffer = []
+
+
+class WorkerRepl:
+    """Runs a ``ReplEngine`` in a Web Worker; same ``push`` as the engine.
+
+    ``worker`` is the Comlink-wrapped ``examples/js/repl_worker.js`` and
+    ``on_output`` a writer the worker can call back (a ``Comlink.proxy``
+    around a PyProxy). ``start`` ships this module's source to the worker,
+    which then streams stdout and stderr to ``on_output`` line by line
+    while commands run, so heavy commands leave the main thread free.
+    """
+
+    def __init__(self, worker: Any, on_output: Any) -> None:
+        self.worker = worker
+        self.on_output = on_output
+        self._more = False
+
+    @property
+    def prompt(self) -> str:
+        return "..." if self._more else ">>>"
+
+    async def start(self) -> None:
+        await self.worker.init(Path(__file__).read_text(), self.on_output)
+
+    async def push(self, line: str) -> bool:
+        self._more = bool(await self.worker.push(line))
+        return self._more
+
+    def reset(self) -> None:
+        self._more = False
+        self.worker.reset()
@@ -1,17 +1,245 @@
 import asyncio
 import sys
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Union
 
-import js
-from pyodide.ffi import create_proxy
+from pyodide_app.ansi import DEFAULT_STYLE, AnsiParser, Line, style_css
+from pyodide_app.bridge.core import IS_EMSCRIPTEN, ProxyOwner
+from pyodide_app.bridge.vdom import (
+    FrameClock,
+    PythonVDOM,
+    VChild,
+    VirtualList,
+    h,
+    request_animation_frame,
+)
+from pyodide_app.repl import ReplEngine, WorkerRepl
 
-from pyodide_app.bridge.core import keep_alive
+if IS_EMSCRIPTEN:
+    import js
+    from pyodide.ffi import create_proxy
+else:
+    from unittest.mock import MagicMock
+
+    js = MagicMock()
+
+    def create_proxy(obj: Any) -> Any:
+        return obj
+
+
+class TerminalWriter:
+    """Buffers ``write()`` calls and hands them to ``sink`` once per frame.
+
+    Every write used to create a ``<span>`` and read ``scrollHeight``,
+    forcing a layout per call. Text is now collected in Python, joined into
+    one chunk and passed to ``sink`` on the next ``clock`` tick, so a loop
+    printing 10k lines costs one DOM append and one scroll per frame. Once
+    ``max_buffer`` characters are pending the chunk is written right away,
+    which keeps memory bounded when a frame is slow to arrive.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[str], None],
+        clock: Optional[FrameClock] = None,
+        max_buffer: int = 64 * 1024,
+    ) -> None:
+        self.sink = sink
+        self.clock: FrameClock = clock or request_animation_frame
+        self.max_buffer = max_buffer
+        self.writes = 0
+        self.flushes = 0
+        self._parts: List[str] = []
+        self._size = 0
+        self._scheduled = False
+
+    @property
+    def pending(self) -> int:
+        """Characters written but not yet handed to ``sink``."""
+        return self._size
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        self._parts.append(text)
+        self._size += len(text)
+        self.writes += 1
+        if self._size >= self.max_buffer:
+            self.flush_sync()
+        elif not self._scheduled:
+            self._scheduled = True
+            self.clock(self._on_frame)
+        return len(text)
+
+    def flush(self) -> None:
+        """File-interface flush; output still goes out on the next frame.
+
+        ``print(..., flush=True)`` and progress bars call this after every
+        update, so honouring it immediately would undo the coalescing.
+        """
+
+    def _on_frame(self, timestamp: Any = None) -> None:
+        self._scheduled = False
+        self.flush_sync()
+
+    def flush_sync(self) -> None:
+        """Hand all pending text to ``sink`` now."""
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self.flushes += 1
+        self.sink(text)
+
+    def discard(self) -> None:
+        """Drop pending text, e.g. when the screen is cleared."""
+        self._parts = []
+        self._size = 0
+
+
+class Scrollback:
+    """The last ``capacity`` lines of output, stored in a ring buffer.
+
+    Lines are indexed from the oldest one still kept; the unterminated line
+    being written, if any, is the last item. Once full, every new line
+    overwrites the oldest, so memory does not grow with the session.
+
+    Text goes through an ``AnsiParser``, so a line is a ``str`` or, if it
+    has colours, a tuple of styled segments. A progress bar redrawn with
+    ``\r`` only ever changes the unterminated line.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self.capacity = capacity
+        self.parser = AnsiParser()
+        self._lines: List[Line] = [""] * capacity
+        self._start = 0
+        self._count = 0
+        # The line after the last newline, as the parser has it.
+        self._partial: Line = ""
+        # Lines overwritten since the start, so views can keep their place.
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._count + (1 if self._partial else 0)
+
+    def __getitem__(self, index: int) -> Line:
+        if index < 0:
+            index += len(self)
+        if index == self._count and self._partial:
+            return self._partial
+        if not 0 <= index < self._count:
+            raise IndexError("scrollback index out of range")
+        return self._lines[(self._start + index) % self.capacity]
+
+    def write(self, text: str) -> None:
+        lines = self.parser.feed(text)
+        self._partial = self.parser.current
+        if len(lines) > self.capacity:
+            # Only the tail of a huge write can survive anyway.
+            self.dropped += len(lines) - self.capacity
+            lines = lines[-self.capacity :]
+        for line in lines:
+            self._push(line)
+
+    def _push(self, line: Line) -> None:
+        if self._count < self.capacity:
+            self._lines[(self._start + self._count) % self.capacity] = line
+            self._count += 1
+        else:
+            self._lines[self._start] = line
+            self._start = (self._start + 1) % self.capacity
+            self.dropped += 1
+
+    def clear(self) -> None:
+        self._lines = [""] * self.capacity
+        self._start = 0
+        self._count = 0
+        self._partial = ""
+        self.parser = AnsiParser()
+
+
+def _render_line(line: Line, index: int) -> Union[VChild, List[VChild]]:
+    if isinstance(line, str):
+        return line
+    # One node per run of identical style, not per character.
+    return [
+        seg.text
+        if seg.style == DEFAULT_STYLE
+        else h("span", {"style": style_css(seg.style)}, seg.text)
+        for seg in line
+    ]
+
+
+class TerminalView(VirtualList):
+    """A ``VirtualList`` over a ``Scrollback`` that follows new output.
+
+    Props are those of ``VirtualList`` with ``items`` being the scrollback;
+    ``render_row`` defaults to text with a ``<span>`` per styled run. While
+    the user is scrolled to the end the view keeps showing the newest lines.
+    Scrolled up, it stays on the same lines even as old ones are dropped
+    from the ring.
+    """
+
+    def __init__(self, props: Dict[str, Any]) -> None:
+        super().__init__({"render_row": _render_line, **props})
+        self.following = True
+        self._dropped = 0
+
+    @property
+    def bottom(self) -> int:
+        """``scroll_top`` at which the last line is in view."""
+        total = len(self.props["items"]) * int(self.props["row_height"])
+        return max(0, total - int(self.props["height"]))
+
+    def on_scroll(self, event: Any) -> None:
+        scroll_top = int(event.target.scrollTop)
+        # Scrolling back to the end resumes following.
+        self.following = scroll_top >= self.bottom - int(self.props["row_height"])
+        super().on_scroll(event)
+
+    def follow_tail(self) -> int:
+        """Re-render after new output; returns the ``scroll_top`` to apply."""
+        items = self.props["items"]
+        if self.following:
+            scroll_top = self.bottom
+        else:
+            shifted = (items.dropped - self._dropped) * int(self.props["row_height"])
+            scroll_top = max(0, int(self.state["scroll_top"]) - shifted)
+        self._dropped = items.dropped
+        self.set_state(scroll_top=scroll_top)
+        return scroll_top
 
 
 class VirtualTerminal:
-    def __init__(self, output_id: str, input_id: str):
+    def __init__(
+        self,
+        output_id: str,
+        input_id: str,
+        clock: Optional[FrameClock] = None,
+        scrollback: int = 10_000,
+        row_height: int = 18,
+        height: int = 300,
+        prompt_id: Optional[str] = None,
+    ):
         self.output_el = js.document.getElementById(output_id)
         self.input_el = js.document.getElementById(input_id)
+        self.prompt_el = js.document.getElementById(prompt_id) if prompt_id else None
+        # Owns the input listener; released by close()
+        self.proxies = ProxyOwner("VirtualTerminal")
+        self.writer = TerminalWriter(self._append, clock)
+
+        # Only the rows in view exist in the DOM, however long the session
+        self.scrollback = Scrollback(scrollback)
+        self.view = TerminalView(
+            {"items": self.scrollback, "row_height": row_height, "height": height}
+        )
+        self.engine = PythonVDOM(output_id)
+        self.engine.mount(self.view)
+
+        # Commands run one at a time, in the order they were entered
+        self.repl: Any = ReplEngine()
+        self._lock = asyncio.Lock()
 
         # Redirect stdout/stderr to this terminal
         sys.stdout = self
@@ -19,50 +247,91 @@ class VirtualTerminal:
 
         self.setup_ui()
 
-    def write(self, text: str) -> None:
+    def write(self, text: str) -> int:
         """Standard write method for file-like objects."""
-        span = js.document.createElement("span")
-        span.innerText = text
-        self.output_el.appendChild(span)
-        # Auto-scroll to bottom
-        self.output_el.scrollTop = self.output_el.scrollHeight
+        return self.writer.write(text)
 
     def flush(self) -> None:
         """Required for file-like interface."""
-        pass
+        self.writer.flush()
+
+    def _append(self, text: str) -> None:
+        self.scrollback.write(text)
+        scroll_top = self.view.follow_tail()
+        # Already inside a frame: patch the visible rows now
+        self.engine.flush_sync()
+        if self.view.following:
+            # A horizontal scrollbar takes part of the height; overshoot and
+            # let the browser clamp to the real end.
+            scroll_top += int(self.view.props["row_height"])
+        # Position is computed from the row count, so no layout is read
+        self.output_el.firstElementChild.scrollTop = scroll_top
+
+    def clear(self) -> None:
+        self.writer.discard()
+        self.scrollback.clear()
+        self.view.following = True
+        self.view.set_state(scroll_top=0)
 
     async def handle_input(self, event: Any) -> None:
-        if event.key == "Enter":
-            command = self.input_el.value
-            self.input_el.value = ""
-
-            print(f">>> {command}")
-            try:
-                # Use pyodide.eval_code or eval for simple expressions
-                # For this pattern, we just echo and demonstrate the capture
-                if command.strip() == "clear":
-                    self.output_el.innerHTML = ""
-                else:
-                    # In a real terminal, you'd use a more robust eval loop
-                    result = eval(command, js.pyodide_globals)  # noqa: S307
-                    if result is not None:
-                        print(str(result))
-            except Exception as e:
-                print(f"Error: {e}")
+        if event.key != "Enter":
+            return
+        command = self.input_el.value
+        self.input_el.value = ""
+
+        prompt = self.repl.prompt
+        print(f"{prompt} {command}")
+        if prompt == ">>>" and command.strip() == "clear":
+            self.clear()
+            return
+        async with self._lock:
+            await self.repl.push(command)
+        self._show_prompt()
+
+    def _show_prompt(self) -> None:
+        if self.prompt_el:
+            self.prompt_el.innerText = self.repl.prompt
+
+    async def use_worker(self, worker: Any) -> None:
+        """Run commands in ``worker`` (``examples/js/repl_worker.js``) from now on.
+
+        The worker's output is streamed back into this terminal, and the
+        page stays responsive while a heavy command runs.
+        """
+        on_output = js.Comlink.proxy(self.proxies.create(self.write))
+        repl = WorkerRepl(worker, on_output)
+        async with self._lock:
+            print("Starting REPL worker...")
+            await repl.start()
+            self.repl = repl
+            print("Commands now run in a worker.")
 
     def setup_ui(self) -> None:
-        proxy = keep_alive(
+        self._on_keydown = self.proxies.adopt(
             create_proxy(lambda e: asyncio.ensure_future(self.handle_input(e)))
         )
-        self.input_el.addEventListener("keydown", proxy)
+        self.input_el.addEventListener("keydown", self._on_keydown)
         print("Python Virtual Terminal Ready.")
-        print("Type a Python expression (e.g. 2+2) or 'clear'.")
+        print("Type Python code (blocks and top-level await work) or 'clear'.")
+
+    def close(self) -> None:
+        """Restore the standard streams and release the input listener."""
+        self.writer.flush_sync()
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+        self.input_el.removeEventListener("keydown", self._on_keydown)
+        self.engine.unmount()
+        self.proxies.destroy()
 
 
-def init_terminal() -> None:
-    # We pass the globals so eval() can access them
-    js.pyodide_globals = globals()
-    VirtualTerminal("term-output", "term-input")
+def init_terminal() -> VirtualTerminal:
+    terminal = VirtualTerminal("term-output", "term-input", prompt_id="term-prompt")
+    # Set by the page when opened with ?worker
+    worker = getattr(js, "term_worker", None)
+    if worker:
+        asyncio.ensure_future(terminal.use_worker(worker))
+    return terminal
 
 
-init_terminal()
+if IS_EMSCRIPTEN:
+    init_terminal()
@@ -1,17 +1,78 @@
 import os
-from typing import Any, Dict
-
-import js
-from pyodide.ffi import create_proxy
+from typing import Any, Dict, List, Tuple
+
+from pyodide_app.bridge.core import IS_EMSCRIPTEN, ProxyOwner
+
+if IS_EMSCRIPTEN:
+    import js
+    from pyodide.ffi import create_proxy
+else:
+    from unittest.mock import MagicMock
+
+    js = MagicMock()
+
+    def create_proxy(obj: Any) -> Any:
+        return obj
+
+
+def _sort_key(node: Dict[str, Any]) -> Tuple[bool, str]:
+    # Directories first, then case-insensitive by name.
+    return node["type"] != "dir", node["name"].lower()
+
+
+def scan_dir(path: str) -> List[Dict[str, Any]]:
+    """List one level of ``path`` as tree nodes, without descending.
+
+    ``os.scandir`` yields the file type with each entry and caches the
+    ``stat`` result, so every entry costs at most one stat call instead of
+    the separate ``isdir`` and ``getsize`` lookups. Directory nodes have
+    ``children`` set to None until they are scanned themselves. Raises
+    ``OSError`` if ``path`` cannot be listed.
+    """
+    nodes: List[Dict[str, Any]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                nodes.append(
+                    {
+                        "name": entry.name,
+                        "path": entry.path,
+                        "type": "dir",
+                        "children": None,
+                    }
+                )
+                continue
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                size = 0  # e.g. a dangling symlink
+            nodes.append(
+                {"name": entry.name, "path": entry.path, "type": "file", "size": size}
+            )
+    nodes.sort(key=_sort_key)
+    return nodes
 
 
 class FSExplorer:
-    def __init__(self, root_id: str):
+    """Tree view of the VFS that loads directories as they are expanded.
+
+    Only ``path`` itself is listed up front. Clicking a directory scans it
+    the first time and shows or hides its entries after that, so large
+    trees such as ``site-packages`` or ``/lib`` can be browsed without
+    walking them.
+    """
+
+    def __init__(self, root_id: str, path: str = "/home"):
         self.root_el = js.document.getElementById(root_id)
+        self.path = path
+        # Owns the click listener; released by close()
+        self.proxies = ProxyOwner("FSExplorer")
+        self._on_click = self.proxies.adopt(create_proxy(self.on_click))
+        self.root_el.addEventListener("click", self._on_click)
         self.refresh()
 
     def get_tree(self, path: str = "/home") -> Dict[str, Any]:
-        """Walk the VFS and return a nested dictionary."""
+        """Return ``path`` with its direct entries; subdirectories unloaded."""
         name: str = os.path.basename(path) or path
         node: Dict[str, Any] = {
             "name": name,
@@ -21,25 +82,7 @@ class FSExplorer:
         }
 
         try:
-            # Skip massive system directories for this pattern's safety
-            if path in ["/lib", "/dev", "/proc"]:
-                return node
-
-            for item in os.listdir(path):
-                full_path = os.path.join(path, item)
-                if os.path.isdir(full_path):
-                    # Limit depth to 2 for the cookbook demonstration
-                    if path.count("/") < 3:
-                        node["children"].append(self.get_tree(full_path))
-                else:
-                    node["children"].append(
-                        {
-                            "name": item,
-                            "path": full_path,
-                            "type": "file",
-                            "size": os.path.getsize(full_path),
-                        }
-                    )
+            node["children"] = scan_dir(path)
         except Exception as e:
             node["name"] = str(node["name"]) + f" (Error: {e})"
 
@@ -55,20 +98,55 @@ class FSExplorer:
         span.innerText = f"{icon} {node['name']}{size_info}"
         li.appendChild(span)
 
-        if node["type"] == "dir" and node["children"]:
-            ul = js.document.createElement("ul")
-            for child in node["children"]:
-                ul.appendChild(self.render_node(child))
-            li.appendChild(ul)
+        if node["type"] == "dir":
+            li.setAttribute("data-path", node["path"])
+            if node["children"] is not None:
+                li.appendChild(self.render_children(node["children"]))
 
         return li
 
+    def render_children(self, children: List[Dict[str, Any]]) -> Any:
+        ul = js.document.createElement("ul")
+        for child in children:
+            ul.appendChild(self.render_node(child))
+        return ul
+
+    def toggle(self, li: Any) -> None:
+        """Expand or collapse a directory's ``<li>``, scanning it once."""
+        if li.childElementCount > 1:
+            ul = li.lastElementChild
+            ul.hidden = not ul.hidden
+            return
+        try:
+            children = scan_dir(li.getAttribute("data-path"))
+        except OSError as e:
+            # Left unloaded, so the next click tries again
+            li.firstElementChild.title = f"Error: {e}"
+            return
+        li.appendChild(self.render_children(children))
+
+    def expand(self, path: str) -> None:
+        """Expand the directory at ``path`` if it is shown and collapsed."""
+        li = self.root_el.querySelector(f'li[data-path="{js.CSS.escape(path)}"]')
+        if li and li.childElementCount == 1:
+            self.toggle(li)
+
+    def on_click(self, event: Any) -> None:
+        # One listener on the root handles every directory label.
+        target = event.target
+        if target.tagName == "SPAN" and target.parentElement.classList.contains("dir"):
+            self.toggle(target.parentElement)
+
     def refresh(self) -> None:
+        """Re-list ``path``; previously expanded directories start collapsed."""
         self.root_el.innerHTML = ""
-        # Start walk at /home for performance and reliability
-        tree = self.get_tree("/home")
+        tree = self.get_tree(self.path)
         self.root_el.appendChild(self.render_node(tree))
 
+    def close(self) -> None:
+        self.root_el.removeEventListener("click", self._on_click)
+        self.proxies.destroy()
+
 
 def init_explorer() -> None:
     # Create some dummy files in /home/pyodide
@@ -84,7 +162,12 @@ def init_explorer() -> None:
         f.write("{}")
 
     explorer = FSExplorer("fs-root")
+    # Open the user's home; everything else loads when clicked
+    explorer.expand(base)
     js.explorer_instance = create_proxy(explorer)
 
 
-init_explorer()
+# Global entry point. Under CPython (tests, benchmarks) the module is only
+# imported for FSExplorer, so don't touch the local file system.
+if IS_EMSCRIPTEN:
+    init_explorer()
@@ -1,4 +1,52 @@
-from pyodide_app.bridge.reactivity import Signal
+import asyncio
+import gc
+import json
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from pyodide_app.bridge import bindings
+from pyodide_app.bridge.bindings import BindingTable
+from pyodide_app.bridge.core import (
+    _GLOBAL_PROXIES,
+    GLOBAL_OWNER,
+    ProxyOwner,
+    keep_alive,
+    leak_report,
+)
+from pyodide_app.bridge.reactivity import (
+    NOTIFY_STATS,
+    Computed,
+    DictChange,
+    ListChange,
+    ObservableDict,
+    ObservableList,
+    ReactiveProfiler,
+    Signal,
+    apply_list_changes,
+    async_effect,
+    batch,
+    debounce,
+    effect,
+    identical,
+    never_equal,
+    observable,
+    throttle,
+)
+from pyodide_app.bridge.shared import SharedSignal
+
+
+class FakeProxy:
+    """Stands in for a PyProxy and records ``destroy()``."""
+
+    def __init__(self) -> None:
+        self.destroyed = False
+
+    def destroy(self) -> None:
+        self.destroyed = True
 
 
 def test_signal_logic_in_cpython():
@@ -22,3 +70,752 @@ def test_signal_type_safety():
     """Basic sanity check for generic Signal."""
     s = Signal[str]("hello")
     assert s.value == "hello"
+
+
+def test_keep_alive_outside_a_scope_is_global():
+    proxy = FakeProxy()
+    assert keep_alive(proxy) is proxy
+    assert _GLOBAL_PROXIES[-1] is proxy
+    assert GLOBAL_OWNER.proxies is _GLOBAL_PROXIES
+    _GLOBAL_PROXIES.pop()
+    GLOBAL_OWNER.sites.pop()
+
+
+def test_scoped_owner_destroys_its_proxies_on_exit():
+    kept = []
+    with ProxyOwner("dialog") as owner:
+        kept.append(keep_alive(FakeProxy()))
+        kept.append(owner.adopt(FakeProxy()))
+        assert owner.live == 2
+        assert not any(p.destroyed for p in kept)
+
+    assert all(p.destroyed for p in kept)
+    assert owner.live == 0
+    assert "dialog" not in leak_report()["owners"]
+
+
+def test_destroying_a_parent_destroys_children_and_release_frees_one():
+    parent = ProxyOwner("page")
+    child = parent.child("sidebar")
+    early, late = parent.adopt(FakeProxy()), child.adopt(FakeProxy())
+    assert parent.live == 2
+
+    parent.release(early)
+    assert early.destroyed and parent.live == 1
+
+    parent.destroy()
+    assert late.destroyed and child.destroyed
+    with pytest.raises(RuntimeError):
+        child.adopt(FakeProxy())
+
+
+def test_leak_report_counts_live_proxies_by_owner_and_site():
+    owner = ProxyOwner("leaky")
+    for _ in range(3):
+        owner.adopt(FakeProxy())
+
+    report = leak_report()
+    assert report["owners"]["leaky"] == 3
+    [site] = [s for s, n in report["sites"].items() if n == 3]
+    assert site.startswith(__file__ + ":")
+    owner.destroy()
+
+
+def test_computed_is_lazy_and_cached():
+    calls = []
+    count = Signal(1)
+    double = Computed(lambda: calls.append(1) or count.value * 2)
+    assert calls == []
+
+    assert double.value == 2
+    assert double.value == 2
+    assert len(calls) == 1
+
+    count.value = 5
+    assert len(calls) == 1
+    assert double.value == 10
+    assert len(calls) == 2
+
+
+def test_diamond_recomputes_each_node_once_without_glitches():
+    a = Signal(1)
+    b = Computed(lambda: a.value + 1)
+    c = Computed(lambda: a.value * 10)
+    d = Computed(lambda: (b.value, c.value))
+    seen = []
+    eff = effect(lambda: seen.append(d.value))
+
+    a.value = 2
+    # Never observes a mix of old and new inputs, e.g. (3, 10).
+    assert seen == [(2, 10), (3, 20)]
+    assert (b.recomputes, c.recomputes, d.recomputes, eff.runs) == (2, 2, 2, 2)
+
+
+def test_effect_stops_when_computed_value_is_unchanged():
+    n = Signal(2)
+    parity = Computed(lambda: n.value % 2)
+    runs = []
+    effect(lambda: runs.append(parity.value))
+
+    n.value = 4
+    assert runs == [0]
+    n.value = 5
+    assert runs == [0, 1]
+
+
+def test_effect_tracks_dynamic_dependencies_and_disposes():
+    flag, left, right = Signal(True), Signal("l"), Signal("r")
+    seen = []
+    eff = effect(lambda: seen.append(left.value if flag.value else right.value))
+
+    right.value = "r2"  # not read yet
+    flag.value = False
+    left.value = "l2"  # no longer read
+    assert seen == ["l", "r2"]
+    assert eff not in left._observers
+
+    eff.dispose()
+    right.value = "r3"
+    assert seen == ["l", "r2"]
+
+
+def test_a_raising_effect_or_subscriber_does_not_stall_the_graph():
+    s = Signal(0)
+    seen = []
+
+    def fragile() -> None:
+        if s.value == 1:
+            raise ValueError("boom")
+
+    effect(fragile)
+    effect(lambda: seen.append(s.value))
+    with pytest.raises(ValueError):
+        s.value = 1
+    assert seen == [0, 1]  # the sibling still ran
+    s.value = 2
+    assert seen == [0, 1, 2]  # and both effects stay subscribed
+
+    double = Computed(lambda: s.value * 2)
+    assert double.value == 4
+
+    def bad_subscriber(value: int) -> None:
+        if value == 3:
+            raise RuntimeError("subscriber failed")
+
+    s.subscribe(bad_subscriber)
+    with pytest.raises(RuntimeError):
+        s.value = 3
+    assert double.value == 6
+    assert seen[-1] == 3
+
+
+@observable
+@dataclass
+class _Form:
+    name: str = ""
+    age: int = 0
+
+
+def test_batch_coalesces_signal_and_observable_notifications():
+    count, form = Signal(0), _Form()
+    seen = []
+    count.subscribe(lambda v: seen.append(("count", v)))
+    form.subscribe("name", lambda v: seen.append(("name", v)))
+    double = Computed(lambda: count.value * 2)
+    effect(lambda: seen.append(("double", double.value)))
+    seen.clear()
+
+    with batch():
+        for i in range(1, 4):
+            count.value = i
+            form.name = f"n{i}"
+        with batch():
+            form.name = "final"
+        assert double.value == 6  # reads inside a batch are current
+        assert seen == []
+
+    assert seen == [("count", 3), ("name", "final"), ("double", 6)]
+
+
+def test_batch_skips_values_that_end_where_they_started():
+    label, form = Signal("a"), _Form(name="x")
+    seen = []
+    label.subscribe(seen.append)
+    form.subscribe("name", seen.append)
+    seen.clear()
+
+    with batch():
+        label.value = "b"
+        label.value = "a"
+        form.name = "y"
+        form.name = "x"
+    assert seen == []
+
+    with batch():
+        label.value = "b"
+        label.value = "c"
+    assert seen == ["c"]
+
+
+def test_a_raising_subscriber_does_not_abort_the_batch_flush():
+    first, second = Signal(0), Signal(0)
+    seen = []
+
+    def fragile(value: int) -> None:
+        if value:
+            raise ValueError("boom")
+
+    first.subscribe(fragile)
+    second.subscribe(seen.append)
+    effect(lambda: seen.append(("effect", first.value)))
+    seen.clear()
+
+    with pytest.raises(ValueError):
+        with batch():
+            first.value = 1
+            second.value = 1
+    assert seen == [1, ("effect", 1)]
+
+
+def test_batch_as_decorator_flushes_once_per_call():
+    form = _Form()
+    seen = []
+    form.subscribe("age", seen.append)
+
+    @batch
+    def birthday(times):
+        for _ in range(times):
+            form.age += 1
+        return form.age
+
+    assert birthday(3) == 3
+    assert seen == [0, 3]
+
+
+def test_unchanged_signal_writes_are_suppressed_and_counted():
+    NOTIFY_STATS.reset()
+    name = Signal("ada")
+    seen = []
+    name.subscribe(seen.append)
+
+    name.value = "ada"
+    name.value = "grace"
+    assert seen == ["ada", "grace"]
+    assert name.suppressed == 1
+    assert NOTIFY_STATS.as_dict() == {
+        "notified": 1,
+        "suppressed": 1,
+        "suppression_rate": 0.5,
+    }
+
+
+def test_equality_policy_is_configurable_per_signal():
+    items = [1]
+    by_identity = Signal(items, equals=identical)
+    always = Signal(0, equals=never_equal)
+    seen = []
+    by_identity.subscribe(seen.append)
+    always.subscribe(seen.append)
+
+    by_identity.value = [1]  # equal, but a different object
+    by_identity.value = by_identity.value
+    always.value = 0
+    assert seen == [[1], 0, [1], 0]
+
+
+@observable(equals=identical)
+@dataclass
+class _Settings:
+    query: str = ""
+    tags: list = field(default_factory=list, metadata={"equals": never_equal})
+
+
+def test_observable_fields_skip_unchanged_writes_per_policy():
+    form, settings = _Form(), _Settings()
+    seen = []
+    form.subscribe("name", seen.append)
+    settings.subscribe("tags", seen.append)
+
+    form.name = ""
+    settings.tags = settings.tags
+    assert seen == ["", [], []]
+
+
+def test_subscribe_returns_a_disposer():
+    count, form = Signal(0), _Form()
+    seen = []
+    stop_count = count.subscribe(seen.append)
+    stop_name = form.subscribe("name", seen.append)
+    stop_count()
+    stop_name()
+
+    count.value = 1
+    form.name = "x"
+    assert seen == [0, ""]
+    assert count._subscribers == ()
+    assert "name" not in form._subscribers
+
+
+def test_unsubscribing_during_notification_is_safe():
+    count = Signal(0)
+    seen = []
+    stop_first = count.subscribe(lambda v: stop_first() if v else None)
+    count.subscribe(seen.append)
+
+    count.value = 1
+    count.value = 2
+    assert seen == [0, 1, 2]
+    assert len(count._subscribers) == 1
+
+
+def test_weak_subscribers_are_dropped_with_their_owner():
+    class Widget:
+        def __init__(self) -> None:
+            self.seen: List[Any] = []
+
+        def update(self, value):
+            self.seen.append(value)
+
+    count, form = Signal(0), _Form()
+    widget = Widget()
+    count.subscribe(widget.update, weak=True)
+    form.subscribe("age", widget.update, weak=True)
+    count.value = 1
+    assert widget.seen == [0, 0, 1]
+
+    del widget
+    gc.collect()
+    assert count._subscribers == ()
+    assert "age" not in form._subscribers
+    count.value = 2
+
+
+def test_observable_only_hooks_fields_that_are_observed():
+    @observable
+    @dataclass
+    class Point:
+        x: int = 0
+        y: int = 0
+
+    @observable
+    class Plain:
+        z = 5
+
+    p = Point()
+    assert "__setattr__" not in vars(Point)
+    assert vars(Point).get("x") == 0  # still the plain dataclass default
+
+    seen = []
+    p.subscribe("x", seen.append)
+    p.x, p.y = 1, 2
+    assert seen == [0, 1]
+    assert vars(p) == {"x": 1, "y": 2, "_subscribers": {"x": (seen.append,)}}
+    assert vars(Point).get("y") == 0  # never observed, never hooked
+    assert Point(x=3).x == 3  # other instances are unaffected
+
+    plain = Plain()
+    plain.subscribe("z", seen.append)
+    plain.z = 6
+    assert seen == [0, 1, 5, 6]
+    assert Plain().z == 5
+
+
+def test_observed_fields_keep_defaults_and_support_delete():
+    @observable
+    @dataclass
+    class Tagged:
+        x: int = 0
+        y: int = field(default=5, init=False)
+
+    t = Tagged()
+    seen: List[Any] = []
+    t.subscribe("y", seen.append)
+    t.subscribe("x", seen.append)
+    assert seen == [5, 0]
+    assert Tagged().y == 5 and Tagged.y == 5  # defaults survive hooking
+    assert Tagged.x == 0
+
+    t.y = 6
+    del t.y  # back to the class default, like an unhooked attribute
+    assert t.y == 5
+    with pytest.raises(AttributeError):
+        del t.y
+    assert seen == [5, 0, 6]
+
+
+def test_observable_list_emits_splice_records():
+    items = ObservableList(["a", "b"])
+    batches = []
+    items.subscribe(batches.append)
+
+    items.append("c")
+    items.insert(0, "z")
+    items[1] = "A"
+    items[1] = "A"  # unchanged: suppressed
+    items.move(0, 3)
+    del items[-1]
+    items.remove("b")
+    items.sort()
+
+    assert batches == [
+        [ListChange("reset", 0, ["a", "b"])],
+        [ListChange("insert", 2, "c")],
+        [ListChange("insert", 0, "z")],
+        [ListChange("set", 1, "A")],
+        [ListChange("move", 3, "z", 0)],
+        [ListChange("remove", 3, "z")],
+        [ListChange("remove", 1, "b")],
+        [ListChange("reset", 0, ["A", "c"])],
+    ]
+
+
+def test_collection_records_are_batched_and_replayable():
+    items = ObservableList(range(5))
+    mirror: List[Any] = []
+    items.subscribe(lambda changes: apply_list_changes(mirror, changes, str))
+    deliveries = []
+    items.subscribe(deliveries.append)
+
+    with batch():
+        items.append(5)
+        items.pop(0)
+        items.move(0, 2)
+        items[0] = 30
+
+    assert len(deliveries) == 2  # the initial reset, then one batch
+    assert len(deliveries[-1]) == 4
+    assert mirror == [str(v) for v in items]
+
+
+def test_observable_dict_records_and_tracking():
+    scores = ObservableDict({"ada": 1})
+    records = []
+    scores.subscribe(records.extend)
+    total = Computed(lambda: sum(scores.values()))
+    assert total.value == 1
+
+    scores["bob"] = 2
+    scores["ada"] = 1  # unchanged
+    del scores["ada"]
+    assert records == [
+        DictChange("reset", None, {"ada": 1}),
+        DictChange("set", "bob", 2),
+        DictChange("delete", "ada", 1),
+    ]
+    assert total.value == 2
+
+
+class FakeElement:
+    """A DOM element with just enough API for collection bindings."""
+
+    def __init__(self, tag: str = "div") -> None:
+        self.tag = tag
+        self.textContent = ""
+        self.attrs: dict = {}
+        self.children: List[FakeElement] = []
+        self.parent: Optional[FakeElement] = None
+
+    def setAttribute(self, name: str, value: str) -> None:  # noqa: N802
+        self.attrs[name] = value
+
+    def insertBefore(self, node, before) -> None:  # noqa: N802
+        if node.parent is not None:
+            node.remove()
+        index = self.children.index(before) if before is not None else None
+        self.children.insert(len(self.children) if index is None else index, node)
+        node.parent = self
+
+    def appendChild(self, node) -> None:  # noqa: N802
+        self.insertBefore(node, None)
+
+    def replaceChildren(self) -> None:  # noqa: N802
+        for child in self.children:
+            child.parent = None
+        self.children = []
+
+    def remove(self) -> None:
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    def texts(self) -> List[str]:
+        return [child.textContent for child in self.children]
+
+
+def test_collection_bindings_patch_only_affected_children():
+    root = FakeElement()
+    created = []
+
+    def create_element(tag):
+        created.append(tag)
+        return FakeElement(tag)
+
+    @observable
+    @dataclass
+    class Todos:
+        items: Any = None
+        tags: Any = None
+
+    todos = Todos(ObservableList(["milk", "eggs"]), ObservableDict({"x": 1}))
+    table = BindingTable(clock=lambda callback: None)
+    with patch.object(bindings, "js") as fake:
+        fake.document.getElementById.return_value = root
+        fake.document.createElement.side_effect = create_element
+        unbind = table.bind(todos, "items", "todo-list")
+        table.flush()
+        first = root.children[0]
+
+        todos.items.insert(1, "bread")
+        todos.items.move(0, 2)
+        todos.items[0] = "rye"
+        table.flush()
+        assert root.texts() == ["rye", "eggs", "milk"]
+        assert root.children[2] is first
+        assert len(created) == 3
+
+        todos.items = ObservableList(["tea"])
+        table.flush()
+        assert root.texts() == ["tea"]
+
+        unbind()
+        todos.items.append("ignored")
+        table.flush()
+        assert root.texts() == ["tea"]
+
+        table.bind(todos, "tags", "tag-list")
+        todos.tags["y"] = 2
+        del todos.tags["x"]
+        table.flush()
+        assert [(c.attrs["data-key"], c.textContent) for c in root.children] == [
+            ("y", "2")
+        ]
+
+        # Text written before a collection took over is not assumed current.
+        todos.tags = "a"
+        table.flush()
+        todos.tags = ObservableList(["x"])
+        table.flush()
+        writes = table.writes
+        todos.tags = "a"
+        table.flush()
+        assert table.writes == writes + 1 and root.innerText == "a"
+
+
+def test_bindings_coalesce_writes_per_tick_and_skip_identical_values():
+    ticks: List[Any] = []
+    table = BindingTable(clock=ticks.append)
+    form = _Form()
+    label, badge = SimpleNamespace(), SimpleNamespace()
+    with patch.object(bindings, "js") as fake:
+        fake.document.getElementById.side_effect = {
+            "label": label,
+            "badge": badge,
+        }.get
+        table.bind(form, "age", "label")
+        table.bind(form, "age", "badge", "title")
+        assert len(ticks) == 1
+
+        for age in range(1, 50):
+            form.age = age
+        assert not hasattr(label, "innerText")  # nothing written before the tick
+        assert len(ticks) == 1
+
+        ticks.pop()()
+        assert (label.innerText, badge.title) == ("49", "49")
+        assert (table.flushes, table.writes, table.lookups) == (1, 2, 2)
+
+        form.age = 50
+        form.age = 49  # back to what the DOM already shows
+        ticks.pop()()
+        assert table.writes == 2
+        assert table.skipped == 2
+        assert table.lookups == 2  # element handles are cached
+
+
+def test_coroutine_subscribers_cancel_the_stale_run():
+    started: List[int] = []
+    finished: List[int] = []
+
+    async def lookup(value: int) -> None:
+        started.append(value)
+        await asyncio.sleep(0.05)
+        finished.append(value)
+
+    async def scenario() -> None:
+        query = Signal(0)
+        stop = query.subscribe(lookup)
+        await asyncio.sleep(0)
+        query.value = 1
+        await asyncio.sleep(0)
+        query.value = 2
+        await asyncio.sleep(0.1)
+        assert started == [0, 1, 2]
+        assert finished == [2]
+
+        query.value = 3
+        await asyncio.sleep(0)
+        stop()  # cancels the run in flight
+        await asyncio.sleep(0.1)
+        assert finished == [2]
+
+    asyncio.run(scenario())
+
+    # Outside a running loop the task could never start, so refuse early.
+    query = Signal(0)
+    with pytest.raises(RuntimeError, match="running asyncio event loop"):
+        query.subscribe(lookup)
+    assert query._subscribers == ()
+
+
+def test_debounce_and_throttle_limit_runs():
+    seen: List[Any] = []
+
+    async def record(value: Any) -> None:
+        seen.append(value)
+
+    async def scenario() -> None:
+        text = Signal("")
+        searcher = debounce(0.03, record)
+        text.subscribe(searcher)
+        for ch in "hello":
+            text.value += ch
+        await asyncio.sleep(0.08)
+        assert seen == ["hello"]
+        assert searcher.dropped == 5
+
+        del seen[:]
+        ticks = Signal(0)
+        limiter = throttle(0.05, record)
+        ticks.subscribe(limiter)
+        for i in range(1, 10):
+            ticks.value = i
+        await asyncio.sleep(0)
+        assert seen == [0]  # leading edge
+        await asyncio.sleep(0.1)
+        assert seen == [0, 9]  # one trailing run with the newest value
+        limiter.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_async_effect_tracks_its_source_until_disposed():
+    seen: List[int] = []
+
+    async def save(total: int) -> None:
+        seen.append(total)
+
+    async def scenario() -> None:
+        a, b = Signal(1), Signal(2)
+        saver = async_effect(lambda: a.value + b.value, save, debounce=0.02)
+        with batch():
+            a.value = 10
+            b.value = 20
+        await asyncio.sleep(0.05)
+        assert seen == [30]
+
+        saver.dispose()
+        a.value = 0
+        await asyncio.sleep(0.05)
+        assert seen == [30]
+        assert not a._observers
+
+    asyncio.run(scenario())
+
+
+def test_shared_signal_sees_writes_from_another_thread_on_poll():
+    position = SharedSignal("3f", (0.0, 0.0, 0.0))
+    # A second signal over the same memory stands in for a worker.
+    worker_side = SharedSignal("3f", memory=position.memory)
+    assert worker_side.value == (0.0, 0.0, 0.0)
+
+    seen: List[Any] = []
+    position.subscribe(seen.append)
+    worker_side.value = (1.0, 2.5, 0.1)
+    assert seen == [(0.0, 0.0, 0.0)]  # nothing until the reader polls
+
+    assert position.poll()
+    assert not position.poll()  # counter unchanged since the last poll
+    assert seen[-1] == worker_side.value
+    assert seen[-1][2] != 0.1  # float32 rounding, same on both sides
+
+    worker_side.value = worker_side.value  # unchanged: no write, no bump
+    assert not position.poll()
+
+    ticks: List[Any] = []
+    stop = position.follow(clock=ticks.append)
+    worker_side.value = (3.0, 3.0, 3.0)
+    ticks.pop()()
+    assert seen[-1] == (3.0, 3.0, 3.0)
+    stop()
+    ticks.pop()()
+    assert not ticks  # stopped following
+
+    # A write equal to a stale local value still overwrites the remote one.
+    worker_side.value = (5.0, 5.0, 5.0)
+    position.value = (3.0, 3.0, 3.0)
+    assert worker_side.poll()
+    assert worker_side.value == (3.0, 3.0, 3.0)
+    assert not position.poll()
+    assert position.value == (3.0, 3.0, 3.0)
+
+
+def test_shared_signal_watch_wakes_on_remote_writes():
+    async def scenario() -> None:
+        progress = SharedSignal("i")
+        worker_side = SharedSignal("i", memory=progress.memory)
+        seen: List[int] = []
+        progress.subscribe(seen.append)
+        watcher = asyncio.ensure_future(progress.watch())
+        await asyncio.sleep(0)
+        for step in (10, 20, 30):
+            worker_side.value = step
+            await asyncio.sleep(0)
+        watcher.cancel()
+        assert seen == [0, 10, 20, 30]
+
+    asyncio.run(scenario())
+
+
+def test_profiler_reports_hot_sources_callbacks_and_cascade_depth():
+    original = Signal._run_subscribers
+    count = Signal(0, name="count")
+    double = Signal(0, name="double")
+    form = _Form()
+    items = ObservableList()
+    count.subscribe(lambda v: setattr(double, "value", v * 2))
+    double.subscribe(lambda v: setattr(form, "age", v))
+    form.subscribe("age", lambda v: items.append(v))
+    renders: List[int] = []
+    items.subscribe(lambda changes: renders.append(len(changes)))
+
+    def watch_count() -> None:
+        renders.append(count.value)
+
+    with ReactiveProfiler() as prof:
+        assert Signal._run_subscribers is not original
+        for i in range(1, 4):
+            count.value = i
+        effect(watch_count)
+        count.value = 4
+    assert Signal._run_subscribers is original  # uninstrumented again
+
+    src = prof.sources
+    assert src["count"].notifications == 4
+    assert src["count"].cascade == 4  # count -> double -> age -> items
+    assert src["double"].notifications == 4
+    assert src["_Form.age"].subscribers == 1
+    assert src[f"effect:{watch_count.__qualname__}"].notifications == 2
+    assert sum(cb.calls for cb in prof.callbacks.values()) == 16
+    assert src["count"].total >= src["double"].total
+
+    # Sorted by a count, not by time, so the order is deterministic.
+    row = prof.table(sort="cascade").splitlines()[1].split()
+    assert row[0] == "count"
+    assert (row[1], row[2], row[-1]) == ("4", "1", "4")
+    trace = json.loads(json.dumps(prof.trace_events()))
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"count", "double", "_Form.age"} <= names
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+
+    count.value = 5  # not recorded once stopped
+    assert src["count"].notifications == 4
@@ -0,0 +1,158 @@
+import asyncio
+import io
+from contextlib import redirect_stderr, redirect_stdout
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+import pytest
+
+from pyodide_app.ansi import PALETTE, AnsiParser, Segment, Style, line_text
+from pyodide_app.bridge.vdom import PythonVDOM, RenderScheduler
+from pyodide_app.repl import ReplEngine
+from pyodide_app.terminal_controller import Scrollback, TerminalView, TerminalWriter
+
+
+def test_writer_coalesces_writes_into_one_chunk_per_frame():
+    ticks: List[Any] = []
+    chunks: List[str] = []
+    writer = TerminalWriter(chunks.append, clock=ticks.append)
+
+    for i in range(10_000):
+        print(i, file=writer, flush=True)
+    assert chunks == []  # nothing reaches the DOM before the frame
+    assert len(ticks) == 1
+
+    ticks.pop()()
+    assert len(chunks) == 1
+    assert chunks[0].splitlines() == [str(i) for i in range(10_000)]
+    assert writer.pending == 0
+
+    ticks_before = len(ticks)
+    writer.flush_sync()  # nothing pending: no empty append
+    assert len(chunks) == 1 and len(ticks) == ticks_before
+
+
+def test_writer_flushes_early_at_the_size_threshold():
+    ticks: List[Any] = []
+    chunks: List[str] = []
+    writer = TerminalWriter(chunks.append, clock=ticks.append, max_buffer=100)
+
+    for _ in range(25):
+        writer.write("0123456789")
+    assert [len(chunk) for chunk in chunks] == [100, 100]
+    assert writer.pending == 50
+
+    writer.discard()
+    ticks.pop()()
+    assert len(chunks) == 2
+    assert writer.flushes == 2
+
+
+def test_scrollback_keeps_only_the_newest_lines():
+    lines = Scrollback(capacity=3)
+    lines.write("one\ntw")
+    assert list(lines) == ["one", "tw"]  # unterminated line is shown too
+    lines.write("o\nthree\nfour\n")
+    assert list(lines) == ["two", "three", "four"]
+    assert lines.dropped == 1
+
+    lines.write("".join(f"{i}\n" for i in range(1_000)) + "tail")
+    # ``capacity`` complete lines, plus the one still being written.
+    assert list(lines) == ["997", "998", "999", "tail"]
+    assert lines[-1] == "tail"
+    assert lines.dropped == 1 + 1_000
+    with pytest.raises(IndexError):
+        lines[4]
+
+
+def test_terminal_view_renders_a_constant_window_and_follows_output():
+    lines = Scrollback(capacity=1_000)
+    view = TerminalView({"items": lines, "row_height": 20, "height": 100})
+    engine = PythonVDOM("term", scheduler=RenderScheduler(lambda cb: None))
+    engine.mount(view)
+
+    lines.write("".join(f"line {i}\n" for i in range(5_000)))
+    assert view.follow_tail() == 1_000 * 20 - 100
+    engine.flush_sync()
+    created = engine.applier.counts["create_element"]
+    first, stop = view.visible_range()
+    assert stop == 1_000 and view.props["items"][stop - 1] == "line 4999"
+
+    # Scrolled up, the view keeps its lines while old ones are dropped.
+    view.on_scroll(SimpleNamespace(target=SimpleNamespace(scrollTop=10_000)))
+    assert not view.following
+    lines.write("more\nmore\n")
+    assert view.follow_tail() == 10_000 - 2 * 20
+    engine.flush_sync()
+    assert engine.applier.counts["create_element"] == created  # rows recycled
+
+
+def test_ansi_parser_groups_styled_text_into_runs():
+    parser = AnsiParser()
+    lines = parser.feed("plain\n\x1b[1;31mERR\x1b[0m: \x1b[32mok\x1b[")
+    assert lines == ["plain"]  # default-styled lines stay plain strings
+    # The escape sequence split across writes is completed by the next one.
+    lines = parser.feed("0m done\x1b]0;title\x07\n")
+    red, green = Style(fg=PALETTE[1], bold=True), Style(fg=PALETTE[2])
+    assert lines == [
+        (
+            Segment("ERR", red),
+            Segment(": ", Style()),
+            Segment("ok", green),
+            Segment(" done", Style()),
+        )
+    ]
+    assert line_text(lines[0]) == "ERR: ok done"
+
+
+def test_scrollback_redraws_carriage_return_progress_in_place():
+    lines = Scrollback(capacity=100)
+    lines.write("start\n")
+    for i in range(1, 1_001):
+        lines.write(f"\r {i // 10:3d}%|\x1b[32m{'#' * (i // 100)}\x1b[0m")
+    assert len(lines) == 2  # one line for the bar, however often it redraws
+    assert line_text(lines[-1]) == " 100%|##########"
+    lines.write("\r\x1b[Kfinished\n")
+    assert list(lines) == ["start", "finished"]
+    assert lines.dropped == 0
+
+
+def _session(engine: ReplEngine, lines: List[str]) -> Tuple[List[bool], str]:
+    out = io.StringIO()
+
+    async def feed() -> List[bool]:
+        return [await engine.push(line) for line in lines]
+
+    with redirect_stdout(out), redirect_stderr(out):
+        more = asyncio.run(feed())
+    return more, out.getvalue()
+
+
+def test_repl_runs_blocks_statements_and_top_level_await():
+    engine = ReplEngine({"asyncio": asyncio})
+    more, output = _session(
+        engine,
+        [
+            "total = 0",
+            "for i in range(4):",
+            "    total += i",
+            "",
+            "total",
+            "await asyncio.sleep(0, 'awaited')",
+            "1 / 0",
+            "def broken(:",
+        ],
+    )
+    assert more == [False, True, True, False, False, False, False, False]
+    assert output.splitlines()[:2] == ["6", "'awaited'"]
+    assert "ZeroDivisionError" in output
+    assert "SyntaxError" in output
+    assert engine.prompt == ">>>"
+
+
+def test_repl_reuses_compiled_code_for_repeated_source():
+    engine = ReplEngine()
+    _, output = _session(engine, ["x = 2", "x * 21", "x * 21"])
+    assert output.splitlines() == ["42", "42"]
+    assert engine.compile.hits == 1
+    assert engine.compile.misses == 2
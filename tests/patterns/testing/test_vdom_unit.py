@@ -0,0 +1,546 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+import pytest
+
+from pyodide_app.bridge.reactivity import ObservableList
+from pyodide_app.bridge.vdom import (
+    EMPTY_CHILDREN,
+    EMPTY_PROPS,
+    Component,
+    ListView,
+    OpCounter,
+    PythonVDOM,
+    RenderScheduler,
+    VirtualList,
+    VNode,
+    decode_ops,
+    h,
+    render_to_string,
+)
+from pyodide_app.reactive_vdom import CounterApp
+
+
+class FakeNode:
+    """Just enough of a DOM node to observe what the reconciler does."""
+
+    def __init__(
+        self, tag: Optional[str] = None, text: Optional[str] = None, vid: int = 0
+    ):
+        self.tag = tag
+        self.vid = vid
+        self.data = text
+        self.attrs: dict = {}
+        self.childNodes: List[FakeNode] = []
+        self.parent: Optional[FakeNode] = None
+
+    def setAttribute(self, name: str, value: str) -> None:  # noqa: N802
+        self.attrs[name] = value
+
+    def removeAttribute(self, name: str) -> None:  # noqa: N802
+        self.attrs.pop(name, None)
+
+    def addEventListener(self, *args: Any) -> None:  # noqa: N802
+        pass
+
+    def removeEventListener(self, *args: Any) -> None:  # noqa: N802
+        pass
+
+    def _detach(self, child: "FakeNode") -> None:
+        if child.parent is not None:
+            child.parent.childNodes.remove(child)
+        child.parent = self
+
+    def appendChild(self, child: "FakeNode") -> None:  # noqa: N802
+        self.insertBefore(child, None)
+
+    def insertBefore(self, child: "FakeNode", ref: Optional["FakeNode"]) -> None:  # noqa: N802
+        self._detach(child)
+        index = len(self.childNodes) if ref is None else self.childNodes.index(ref)
+        self.childNodes.insert(index, child)
+
+    def removeChild(self, child: "FakeNode") -> None:  # noqa: N802
+        self.childNodes.remove(child)
+        child.parent = None
+
+    def replaceChild(self, new: "FakeNode", old: "FakeNode") -> None:  # noqa: N802
+        self.insertBefore(new, old)
+        self.removeChild(old)
+
+    def replaceChildren(self, *children: "FakeNode") -> None:  # noqa: N802
+        self.childNodes = []
+        for child in children:
+            self.appendChild(child)
+
+    def text(self) -> str:
+        if self.tag is None:
+            return self.data or ""
+        return "".join(child.text() for child in self.childNodes)
+
+
+class FakeApplier:
+    """Python mirror of examples/js/vdom_applier.js running on FakeNodes."""
+
+    def __init__(self) -> None:
+        self.container = FakeNode("div")
+        self.nodes: Dict[int, FakeNode] = {0: self.container}
+        self.batches: List[List[tuple]] = []
+
+    def apply(self, ops: Sequence[int], strings: Sequence[str]) -> None:
+        batch = decode_ops(ops, strings)
+        self.batches.append(batch)
+        for name, *args in batch:
+            if name == "create_element":
+                self.nodes[args[0]] = FakeNode(args[1], vid=args[0])
+            elif name == "create_text":
+                self.nodes[args[0]] = FakeNode(text=args[1], vid=args[0])
+            elif name == "set_attr":
+                self.nodes[args[0]].setAttribute(args[1], args[2])
+            elif name == "remove_attr":
+                self.nodes[args[0]].removeAttribute(args[1])
+            elif name == "set_text":
+                self.nodes[args[0]].data = args[1]
+            elif name == "insert":
+                before = self.nodes[args[2]] if args[2] else None
+                self.nodes[args[0]].insertBefore(self.nodes[args[1]], before)
+            elif name == "remove":
+                node = self.nodes[args[0]]
+                if node.parent is not None:
+                    node.parent.removeChild(node)
+                self._forget(node)
+            elif name == "replace_children":
+                self.nodes[args[0]].replaceChildren(self.nodes[args[1]])
+
+    def _forget(self, node: FakeNode) -> None:
+        self.nodes.pop(node.vid, None)
+        for child in node.childNodes:
+            self._forget(child)
+
+    def created(self) -> int:
+        return sum(op[0] == "create_element" for op in self.batches[-1])
+
+
+@pytest.fixture
+def engine():
+    applier = FakeApplier()
+    vdom = PythonVDOM("root", applier=applier)
+    vdom.container = applier.container
+    return vdom
+
+
+def _list(keys: List[str]) -> Any:
+    return h("ul", {}, [h("li", {"key": k}, k) for k in keys])
+
+
+def test_patch_updates_text_in_place(engine):
+    engine.patch(h("div", {"class": "card"}, [h("p", {}, "Count: 0")]))
+    p = engine.container.childNodes[0].childNodes[0]
+
+    engine.patch(h("div", {"class": "card"}, [h("p", {}, "Count: 1")]))
+
+    assert engine.container.childNodes[0].childNodes[0] is p
+    assert p.text() == "Count: 1"
+    assert engine.applier.batches[-1] == [("set_text", 3, "Count: 1")]
+
+
+def test_patch_diffs_attributes(engine):
+    engine.patch(h("div", {"class": "a", "title": "t"}))
+    engine.patch(h("div", {"class": "b", "id": "x"}))
+    assert engine.container.childNodes[0].attrs == {"class": "b", "id": "x"}
+
+
+def test_keyed_children_are_moved_not_recreated(engine):
+    engine.patch(_list(["a", "b", "c", "d"]))
+    ul = engine.container.childNodes[0]
+    before = {node.text(): node for node in ul.childNodes}
+
+    engine.patch(_list(["d", "b", "a", "e"]))
+
+    assert [node.text() for node in ul.childNodes] == ["d", "b", "a", "e"]
+    for key in "dba":
+        assert ul.childNodes["dba".index(key)] is before[key]
+    # Only the new "e" row is created.
+    assert engine.applier.created() == 1
+
+
+def test_replacing_tag_swaps_node(engine):
+    engine.patch(h("div", {}, [h("span", {}, "x")]))
+    engine.patch(h("div", {}, [h("em", {}, "x"), "tail"]))
+    div = engine.container.childNodes[0]
+    assert [child.tag for child in div.childNodes] == ["em", None]
+    assert div.text() == "xtail"
+
+
+def test_each_patch_is_a_single_applier_call(engine):
+    engine.patch(_list(["a", "b", "c"]))
+    engine.patch(_list(["c", "b", "a"]))
+    engine.patch(_list(["c", "b", "a"]))
+    # The last patch changed nothing, so nothing crossed the bridge.
+    assert len(engine.applier.batches) == 2
+
+
+def test_op_counter_measures_render_cost_in_cpython():
+    engine = PythonVDOM("root")
+    assert isinstance(engine.applier, OpCounter)
+
+    engine.patch(h("ul", {}, [h("li", {"key": i}, str(i)) for i in range(100)]))
+    assert engine.applier.counts["create_element"] == 101
+    assert engine.applier.counts["create_text"] == 100
+
+    engine.applier.reset()
+    engine.patch(h("ul", {}, [h("li", {"key": i}, str(i)) for i in range(1, 101)]))
+    # One row dropped at the front, one appended at the back.
+    assert engine.applier.counts["remove"] == 1
+    assert engine.applier.counts["create_element"] == 1
+    assert engine.applier.batches == 1
+
+
+def test_handlers_are_swapped_without_new_listeners(engine):
+    calls: List[str] = []
+    engine.patch(h("button", {"onclick": lambda e: calls.append("first")}, "Go"))
+    engine.patch(h("button", {"onclick": lambda e: calls.append("second")}, "Go"))
+
+    assert [op for op in engine.applier.batches[0] if op[0] == "delegate"] == [
+        ("delegate", "click")
+    ]
+    assert engine.applier.batches[1:] == []
+    engine._dispatch("click", [engine._root.id], SimpleNamespace())
+    assert calls == ["second"]
+
+
+def test_delegated_events_bubble_until_stopped(engine):
+    calls: List[str] = []
+
+    def stop(event: Any) -> None:
+        calls.append("inner")
+        event.cancelBubble = True
+
+    engine.patch(
+        h(
+            "div",
+            {"onclick": lambda e: calls.append("outer")},
+            [h("button", {"onclick": lambda e: calls.append("inner")}, "Go")],
+        )
+    )
+    outer = engine._root
+    inner = outer.children[0]
+    engine._dispatch("click", [inner.children[0].id, inner.id, outer.id], object())
+    assert calls == ["inner", "outer"]
+
+    calls.clear()
+    engine.patch(
+        h("div", {"onclick": lambda e: None}, [h("button", {"onclick": stop})])
+    )
+    engine._dispatch("click", [inner.id, outer.id], SimpleNamespace())
+    assert calls == ["inner"]
+
+
+def test_handlers_of_removed_nodes_are_released(engine):
+    def rows(n: int) -> Any:
+        return h(
+            "ul", {}, [h("li", {"key": i, "onclick": lambda e: None}) for i in range(n)]
+        )
+
+    engine.patch(rows(50))
+    assert engine.handler_count == 50
+    for _ in range(20):
+        engine.patch(rows(50))
+    engine.patch(rows(3))
+    assert engine.handler_count == 3
+
+    engine.patch(h("p", {}, "gone"))
+    assert engine.handler_count == 0
+
+
+class Label(Component):
+    def render(self) -> VNode:
+        return h("span", {"class": "label"}, self.props["text"])
+
+
+def test_component_view_is_memoized_on_props_and_state():
+    label = Label({"text": "hi"})
+    first = label.view()
+    assert label.view({"text": "hi"}) is first
+    assert (label.memo.hits, label.memo.misses) == (1, 1)
+
+    assert label.view({"text": "bye"}) is not first
+    label.set_state(flag=True)
+    label.view()
+    assert (label.memo.hits, label.memo.misses) == (1, 3)
+
+
+def test_memoized_subtrees_skip_diffing_and_dom_work():
+    engine = PythonVDOM("root", scheduler=RenderScheduler(clock=lambda cb: None))
+    app = CounterApp()
+    engine.mount(app)
+    engine.applier.reset()
+
+    app.increment(None)
+    engine.flush_sync()
+    app.increment(None)
+    engine.flush_sync()
+
+    # Heading and both buttons came straight from their caches.
+    assert app.heading.memo.hits == 2
+    assert engine.skipped_subtrees == 6
+    assert engine.applier.counts["set_text"] == 2
+    assert engine.applier.total == 2
+
+
+def test_vnode_keeps_dict_style_access_and_shares_empty_defaults():
+    node = h("li", {"key": 7, "class": "row"}, "text")
+    assert node["tag"] == "li"
+    assert node["props"]["class"] == "row"
+    assert list(node["children"]) == ["text"]
+    assert node.key == 7
+
+    bare = h("br")
+    assert bare.props is EMPTY_PROPS
+    assert bare.children is EMPTY_CHILDREN
+    assert h("b", {}, []).props is EMPTY_PROPS
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.callbacks: List[Any] = []
+
+    def __call__(self, callback: Any) -> None:
+        self.callbacks.append(callback)
+
+    def tick(self) -> None:
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(0.0)
+
+
+def test_state_changes_coalesce_into_one_patch_per_frame():
+    clock = FakeClock()
+    engine = PythonVDOM("root", scheduler=RenderScheduler(clock))
+    app = CounterApp()
+    engine.mount(app)
+    engine.applier.reset()
+
+    app.increment(None)
+    app.increment(None)
+    app.increment(None)
+    assert len(clock.callbacks) == 1
+    assert engine.applier.batches == 0
+
+    clock.tick()
+    assert engine.applier.batches == 1
+    assert engine.applier.counts["set_text"] == 1
+    assert engine.component is app and app.count == 3
+
+
+def test_flush_sync_renders_immediately():
+    clock = FakeClock()
+    engine = PythonVDOM("root", scheduler=RenderScheduler(clock))
+    app = CounterApp()
+    engine.mount(app)
+    engine.applier.reset()
+
+    app.increment(None)
+    engine.flush_sync()
+    assert engine.applier.batches == 1
+
+    # The frame that was already requested finds nothing left to do.
+    clock.tick()
+    assert engine.applier.batches == 1
+
+
+def test_default_clock_uses_request_animation_frame():
+    with patch("pyodide_app.bridge.vdom.js") as fake_js:
+        scheduler = RenderScheduler()
+        engine = PythonVDOM("root", scheduler=scheduler)
+        app = CounterApp()
+        engine.mount(app)
+
+        app.increment(None)
+        app.reset(None)
+        fake_js.requestAnimationFrame.assert_called_once()
+
+        (callback,) = fake_js.requestAnimationFrame.call_args[0]
+        callback(16.0)
+        assert scheduler.flushes == 1 and not scheduler.pending
+
+
+class Toggle(Component):
+    def render(self) -> VNode:
+        return h("button", {}, "on" if self.state.get("on") else "off")
+
+
+class Panel(Component):
+    def __init__(self) -> None:
+        super().__init__()
+        self.toggle = Toggle()
+
+    def render(self) -> VNode:
+        return h("div", {}, [self.toggle.view()])
+
+
+def test_child_state_change_rerenders_through_memoized_parents():
+    clock = FakeClock()
+    applier = FakeApplier()
+    engine = PythonVDOM("root", applier=applier, scheduler=RenderScheduler(clock))
+    panel = Panel()
+    engine.mount(panel)
+
+    panel.toggle.set_state(on=True)
+    clock.tick()
+    assert applier.container.text() == "on"
+
+
+def test_render_to_string_produces_static_html():
+    tree = h(
+        "div",
+        {"class": "card", "key": "k", "onclick": lambda e: None},
+        [
+            h("h2", {"title": 'say "hi"'}, "<Tom & Jerry>"),
+            h("br"),
+            "a",
+            "b",
+        ],
+    )
+    assert render_to_string(tree) == (
+        '<div class="card">'
+        '<h2 title="say &quot;hi&quot;">&lt;Tom &amp; Jerry&gt;</h2>'
+        "<br>a<!-- -->b</div>"
+    )
+
+
+def test_hydrate_adopts_markup_and_only_wires_handlers():
+    applier = OpCounter()
+    engine = PythonVDOM("root", applier=applier)
+    app = CounterApp()
+    engine.mount(app, hydrate=True)
+
+    assert applier.counts["adopt"] == 5
+    assert applier.counts["adopt_text"] == 4
+    assert applier.counts["delegate"] == 1
+    assert applier.counts["create_element"] == applier.counts["set_attr"] == 0
+    assert engine.handler_count == 2
+
+    applier.reset()
+    app.increment(None)
+    engine.flush_sync()
+    assert applier.total == 1 and applier.counts["set_text"] == 1
+
+
+def test_hydration_mismatch_falls_back_to_client_render(capsys):
+    class MismatchApplier(FakeApplier):
+        rejected: List[Any] = []
+
+        def apply(self, ops: Sequence[int], strings: Sequence[str]) -> None:
+            decoded = decode_ops(ops, strings)
+            if any(op[0] == "adopt" for op in decoded):
+                self.rejected = decoded
+                raise RuntimeError("Hydration mismatch")
+            super().apply(ops, strings)
+
+    applier = MismatchApplier()
+    engine = PythonVDOM("root", applier=applier)
+    engine.hydrate(h("p", {"onclick": lambda e: None}, "x"))
+
+    assert "hydration failed" in capsys.readouterr().out
+    assert applier.container.text() == "x"
+    # Text is adopted with its expected content, so the applier can compare.
+    assert [op for op in applier.rejected if op[0] != "delegate"] == [
+        ("adopt", 0, 1, "p"),
+        ("adopt_text", 1, 2, "x"),
+    ]
+    assert engine.handler_count == 1
+    assert ("delegate", "click") in applier.batches[0]
+
+
+def _virtual_list(count: int) -> VirtualList:
+    return VirtualList(
+        {
+            "items": range(count),
+            "render_row": lambda item, index: f"Row {item}",
+            "row_height": 20,
+            "height": 400,
+            "overscan": 5,
+        }
+    )
+
+
+def _scroll(vlist: VirtualList, top: int) -> None:
+    vlist.on_scroll(SimpleNamespace(target=SimpleNamespace(scrollTop=top)))
+
+
+def test_virtual_list_renders_a_constant_window():
+    small = PythonVDOM("root", scheduler=RenderScheduler(FakeClock()))
+    small.mount(_virtual_list(1_000))
+    huge = PythonVDOM("root", scheduler=RenderScheduler(FakeClock()))
+    huge.mount(_virtual_list(100_000))
+
+    # 20 visible rows + 2 * 5 overscan + 1 partial row, plus list and spacer.
+    assert huge.applier.counts["create_element"] == 31 + 2
+    assert huge.applier.counts == small.applier.counts
+
+
+def test_virtual_list_recycles_rows_while_scrolling():
+    clock = FakeClock()
+    applier = FakeApplier()
+    engine = PythonVDOM("root", applier=applier, scheduler=RenderScheduler(clock))
+    vlist = _virtual_list(100_000)
+    engine.mount(vlist)
+    spacer = applier.container.childNodes[0].childNodes[0]
+    rows_before = list(spacer.childNodes)
+
+    _scroll(vlist, 5)  # still inside the first row: no render
+    assert clock.callbacks == []
+
+    for top in (200, 220, 50_000, 1_999_600):
+        _scroll(vlist, top)
+        clock.tick()
+        assert applier.created() == 0
+        assert "insert" not in {op[0] for op in applier.batches[-1]}
+
+    assert list(spacer.childNodes) == rows_before
+    assert sorted(int(row.text().split()[1]) for row in spacer.childNodes)[-1] == 99_999
+    assert vlist.visible_range() == (99_969, 100_000)
+
+
+def test_unmount_removes_the_tree_and_frees_engine_proxies(engine):
+    clicks: List[Any] = []
+    engine.patch(h("button", {"onclick": clicks.append}, "Go"))
+    engine.proxies.adopt(SimpleNamespace(destroy=lambda: clicks.append("freed")))
+    engine.unmount()
+
+    assert engine.container.childNodes == []
+    assert engine.handler_count == 0
+    assert engine.proxies.live == 0
+    assert clicks == ["freed"]
+
+
+def test_list_view_replays_change_records_on_cached_rows():
+    applier = FakeApplier()
+    engine = PythonVDOM("root", applier=applier, scheduler=RenderScheduler(FakeClock()))
+    engine.container = applier.container
+    items = ObservableList(range(100))
+    view = ListView(
+        {"items": items, "render_item": lambda i: h("li", {"key": i}, str(i))}
+    )
+    engine.mount(view)
+    ul = engine.container.childNodes[0]
+    assert view.renders == 100
+
+    items.insert(50, 1000)
+    items.move(0, 99)
+    del items[10]
+    engine.flush_sync()
+
+    assert view.renders == 101  # only the inserted row was rendered
+    assert [int(li.text()) for li in ul.childNodes] == list(items)
+    ops = [op[0] for op in applier.batches[-1]]
+    assert sorted(ops) == [
+        "create_element",
+        "create_text",
+        "insert",
+        "insert",
+        "insert",
+        "remove",
+    ]
+    assert engine.skipped_subtrees >= 97
@@ -0,0 +1,59 @@
+import os
+from unittest.mock import MagicMock
+
+from pyodide_app.vfs_controller import FSExplorer, scan_dir
+
+
+def _make_tree(root: str) -> None:
+    os.makedirs(os.path.join(root, "pkg", "deep", "deeper"))
+    with open(os.path.join(root, "b.txt"), "w") as f:
+        f.write("12345")
+    with open(os.path.join(root, "pkg", "mod.py"), "w") as f:
+        f.write("x = 1")
+    os.makedirs(os.path.join(root, "Data"))
+
+
+def test_scan_dir_lists_one_level_with_sizes(tmp_path):
+    root = str(tmp_path)
+    _make_tree(root)
+
+    nodes = scan_dir(root)
+    assert [(n["name"], n["type"]) for n in nodes] == [
+        ("Data", "dir"),
+        ("pkg", "dir"),
+        ("b.txt", "file"),
+    ]
+    assert nodes[2]["size"] == 5
+    assert nodes[1]["path"] == os.path.join(root, "pkg")
+    # Subdirectories are not walked until asked for.
+    assert nodes[1]["children"] is None
+
+
+def test_explorer_loads_directories_on_expand(tmp_path):
+    root = str(tmp_path)
+    _make_tree(root)
+    explorer = FSExplorer("fs-root", root)
+    tree = explorer.get_tree(root)
+    assert all(
+        n.get("children") is None for n in tree["children"] if n["type"] == "dir"
+    )
+
+    li = MagicMock(childElementCount=1)
+    li.getAttribute.return_value = os.path.join(root, "pkg")
+    rendered = []
+    explorer.render_children = rendered.append
+    explorer.toggle(li)
+    assert [n["name"] for n in rendered[0]] == ["deep", "mod.py"]
+
+    # Once loaded, a click only shows or hides the entries.
+    li.childElementCount = 2
+    li.lastElementChild.hidden = False
+    explorer.toggle(li)
+    assert li.lastElementChild.hidden is True
+    assert len(rendered) == 1
+
+    li = MagicMock(childElementCount=1)
+    li.getAttribute.return_value = os.path.join(root, "missing")
+    explorer.toggle(li)  # error shown on the label, nothing rendered
+    assert len(rendered) == 1
+    assert "Error" in li.firstElementChild.title